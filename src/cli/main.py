@@ -14,7 +14,7 @@ import click
 from ..models.system_configuration import SystemConfiguration
 from ..services.config_manager import ConfigManager
 from ..services.restart_controller import RestartController
-from ..services.template_manager import TemplateManager
+from ..services.template_manager import TEMPLATE_MANAGER, TemplateManager
 
 
 # Global context object
@@ -75,7 +75,7 @@ def cli(
 
         # Initialize controller
         ctx.controller = RestartController(ctx.config)
-        ctx.template_manager = TemplateManager()
+        ctx.template_manager = TEMPLATE_MANAGER
 
         # Determine test mode
         env_test_mode = os.getenv("CLAUDE_RESTART_TEST_MODE")
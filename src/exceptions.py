@@ -10,17 +10,33 @@ from typing import Any, Optional
 class MonitoringException(Exception):
     """Base exception for all monitoring-related errors."""
 
+    _str: Optional[str] = None  # cached __str__ result
+
     def __init__(self, message: str, details: Optional[Any] = None):
         """Initialize with message and optional details."""
         self.message = message
         self.details = details
         super().__init__(self.message)
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Drop the cached string form when the message or details change."""
+        super().__setattr__(name, value)
+        if name in ("message", "details"):
+            super().__setattr__("_str", None)
+
     def __str__(self) -> str:
-        """String representation with details if available."""
-        if self.details:
-            return f"{self.message} (Details: {self.details})"
-        return self.message
+        """String representation with details if available.
+
+        Formatted once and cached; replacing ``message`` or ``details``
+        (as ``with_context`` does) re-formats it, in-place edits of a
+        details dict do not.
+        """
+        if self._str is None:
+            if self.details:
+                self._str = f"{self.message} (Details: {self.details})"
+            else:
+                self._str = self.message
+        return self._str
 
 
 class ProcessException(MonitoringException):
@@ -1,3 +1,3 @@
 """Utility library modules for the Claude Code Looper project."""
 
-__all__ = ["signal_handler", "logging_config", "windows_process"]
+__all__ = ["signal_handler", "logging_config", "windows_process", "linux_process"]
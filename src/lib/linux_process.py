@@ -0,0 +1,108 @@
+"""Direct ``/proc`` readers for cheap process sampling on Linux."""
+
+import os
+import sys
+from typing import NamedTuple
+
+# True when /proc/<pid>/stat can be read (Linux only; macOS has no /proc)
+AVAILABLE = sys.platform.startswith("linux")
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if AVAILABLE else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if AVAILABLE else 4096
+PHYS_PAGES = os.sysconf("SC_PHYS_PAGES") if AVAILABLE else 0
+
+# psutil status names for the state letters in /proc/<pid>/stat
+STATUS_NAMES = {
+    "R": "running",
+    "S": "sleeping",
+    "D": "disk-sleep",
+    "T": "stopped",
+    "t": "tracing-stop",
+    "Z": "zombie",
+    "X": "dead",
+    "x": "dead",
+    "K": "wake-kill",
+    "W": "waking",
+    "I": "idle",
+    "P": "parked",
+}
+
+
+class ProcStat(NamedTuple):
+    """Subset of ``/proc/<pid>/stat`` used for resource sampling."""
+
+    state: str
+    utime: int  # clock ticks spent in user mode
+    stime: int  # clock ticks spent in kernel mode
+    num_threads: int
+    rss_pages: int
+
+    @property
+    def cpu_seconds(self) -> float:
+        """Total CPU time consumed by the process."""
+        return (self.utime + self.stime) / CLOCK_TICKS
+
+    @property
+    def rss_bytes(self) -> int:
+        """Resident set size in bytes."""
+        return self.rss_pages * PAGE_SIZE
+
+    @property
+    def memory_percent(self) -> float:
+        """Resident set size as a percentage of physical memory."""
+        return 100.0 * self.rss_pages / PHYS_PAGES if PHYS_PAGES else 0.0
+
+    @property
+    def status(self) -> str:
+        """Process status, named as psutil names it."""
+        return STATUS_NAMES.get(self.state, self.state)
+
+
+def parse_stat(data: bytes) -> ProcStat:
+    """Parse the contents of a ``/proc/<pid>/stat`` file.
+
+    The command name (field 2) may itself contain spaces and parentheses,
+    so fields are counted from the last closing parenthesis.
+    """
+    fields = data[data.rindex(b")") + 2 :].split()
+    return ProcStat(
+        state=fields[0].decode("ascii"),
+        utime=int(fields[11]),
+        stime=int(fields[12]),
+        num_threads=int(fields[17]),
+        rss_pages=int(fields[21]),
+    )
+
+
+def read_stat(pid: int) -> ProcStat:
+    """Read ``/proc/<pid>/stat`` with a single read.
+
+    Raises:
+        FileNotFoundError: If the process does not exist
+        PermissionError: If the stat file cannot be read
+    """
+    with open(f"/proc/{pid}/stat", "rb") as handle:
+        return parse_stat(handle.read())
+
+
+def count_open_files(pid: int) -> int:
+    """Count the regular files a process has open.
+
+    Counts the descriptors that link to an existing regular file, as
+    psutil's ``open_files()`` does, but without reading each descriptor's
+    ``fdinfo``; pipes, sockets and terminals are not counted.
+
+    Raises:
+        FileNotFoundError: If the process does not exist
+        PermissionError: If the descriptor table cannot be read
+    """
+    fd_dir = f"/proc/{pid}/fd"
+    count = 0
+    for name in os.listdir(fd_dir):
+        try:
+            target = os.readlink(f"{fd_dir}/{name}")
+        except OSError:  # closed since the listing
+            continue
+        if target.startswith("/") and os.path.isfile(target):
+            count += 1
+    return count
@@ -4,12 +4,13 @@ Represents an active monitoring period of Claude Code terminal output,
 including start time, current status, and detection history.
 """
 
+import threading
 import uuid
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
 
 from .restart_command_config import RestartCommandConfiguration
 
@@ -47,6 +48,35 @@ class MonitoringSession(BaseModel):
 
     model_config = ConfigDict(use_enum_values=True)
 
+    # Notified when one of this session's fields changes value, see wait_until
+    _changed: threading.Condition = PrivateAttr(default_factory=threading.Condition)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        fields = self.__dict__
+        unchanged = name in fields and fields[name] == value
+        super().__setattr__(name, value)
+        if not unchanged and name in fields:
+            with self._changed:
+                self._changed.notify_all()
+
+    def wait_until(
+        self, predicate: Callable[[], bool], timeout: Optional[float] = None
+    ) -> bool:
+        """Block until a predicate over session state holds.
+
+        The predicate is re-evaluated each time a field of this session
+        changes value, so state transitions are seen without polling.
+
+        Args:
+            predicate: Zero-argument callable checked after every change
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            The final result of the predicate
+        """
+        with self._changed:
+            return self._changed.wait_for(predicate, timeout)
+
     @field_validator("claude_command")
     def validate_claude_command(cls, v):
         """Validate Claude Code command."""
@@ -4,13 +4,18 @@ Represents global system settings and preferences for the automated
 restart monitoring system.
 """
 
+import copy
 import os
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from ..utils.files import atomic_write_bytes
+from ..utils.serialization import dumps, loads
+
 
 class LogLevel(str, Enum):
     """Available log levels."""
@@ -32,6 +37,15 @@ def _default_monitoring() -> Dict[str, Any]:
     }
 
 
+@lru_cache(maxsize=4)
+def _default_config_dict(config_cls: type) -> Dict[str, Any]:
+    """Serialized defaults of a configuration class, built once per class.
+
+    Callers must copy the result before modifying it.
+    """
+    return config_cls.create_default().model_dump(mode="json")
+
+
 class SystemConfiguration(BaseModel):
     """Model representing system configuration settings."""
 
@@ -371,7 +385,6 @@ class SystemConfiguration(BaseModel):
 
     def to_file(self, file_path: str) -> None:
         """Save configuration to JSON file."""
-        import json
         from datetime import datetime
 
         # Update metadata
@@ -381,8 +394,7 @@ class SystemConfiguration(BaseModel):
         # Ensure directory exists
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(self.model_dump(mode="json"), f, indent=2, ensure_ascii=False)
+        atomic_write_bytes(file_path, dumps(self.model_dump(mode="json"), indent=True))
 
     def __str__(self) -> str:
         """String representation of the configuration."""
@@ -424,12 +436,9 @@ class SystemConfiguration(BaseModel):
     @classmethod
     def from_file(cls, file_path: str) -> "SystemConfiguration":
         """Load configuration from JSON file with default merge."""
-        import json
-
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = loads(Path(file_path).read_bytes())
 
-        default_dict = cls.create_default().model_dump(mode="json")
+        default_dict = copy.deepcopy(_default_config_dict(cls))
         merged = cls._merge_dict(default_dict, data)
 
         # Ensure enum fields maintain their enum types after merging
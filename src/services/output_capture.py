@@ -1,34 +1,95 @@
 """OutputCapture service for process output management."""
 
+import os
+import re
+import selectors
 import subprocess
 import threading
 import time
 from collections import deque
-from typing import Dict, List, Optional
+from itertools import islice
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union
 
 from ..models.system_configuration import SystemConfiguration
 
+# Pipes cannot be polled with selectors on Windows; use reader threads there
+_USE_SELECTOR = os.name != "nt"
+
+# Line endings recognised in process output (matches universal newlines)
+_LINE_SPLIT = re.compile(rb"\r\n|\r|\n")
+
+_READ_SIZE = 65536
+
+# Reads allowed when draining a pipe under the capture lock on stop; a
+# process still writing cannot keep the lock held indefinitely
+_DRAIN_MAX_READS = 16
+
+
+# Captured lines are kept as raw bytes and decoded only when read back;
+# injected lines are stored as str
+_Line = Union[bytes, str]
+
+
+class _PipeReader:
+    """Line splitting state for one stdout pipe.
+
+    Lines are split in bulk on the raw bytes; a multi-byte character can
+    never straddle a line ending, so decoding is left to the readers.
+    """
+
+    def __init__(self, process: subprocess.Popen):
+        self.process = process  # keeps the pipe open while registered
+        self.fd = process.stdout.fileno()
+        self.encoding = getattr(process.stdout, "encoding", None) or "utf-8"
+        self.pending = b""
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Split a chunk and return the complete lines it finished."""
+        *lines, self.pending = _LINE_SPLIT.split(self.pending + data)
+        return lines
+
+    def flush(self) -> List[bytes]:
+        """Return whatever is left once the pipe reaches EOF."""
+        remaining, self.pending = self.pending, b""
+        return [remaining] if remaining else []
+
 
 class OutputCapture:
     """Service for capturing and managing process output streams."""
 
-    def __init__(self, config: SystemConfiguration):
+    def __init__(
+        self,
+        config: SystemConfiguration,
+        on_output: Optional[Callable[[str], None]] = None,
+    ):
         """Initialize the output capture service.
 
         Args:
             config: System configuration containing buffer settings
+            on_output: Called with the session ID whenever new lines are
+                captured, outside the capture lock
         """
         self.config = config
+        self.on_output = on_output
         self.output_buffer_size = config.monitoring.get("output_buffer_size", 1000)
 
-        # Storage for captured output
-        self.output_buffers: Dict[str, deque] = {}
+        # Storage for captured output (raw lines, see _decode_lines)
+        self.output_buffers: Dict[str, Deque[_Line]] = {}
+        self._encodings: Dict[str, str] = {}
+        # Lines ever appended per session; a position in this count marks
+        # how far a reader got (see read_recent_output / clear_output)
+        self._line_counts: Dict[str, int] = {}
         self.output_threads: Dict[str, threading.Thread] = {}
 
         # Thread safety
         self._lock = threading.RLock()
         self._shutdown_event = threading.Event()
 
+        # POSIX: one selector thread serves every session's pipe
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._selector_thread: Optional[threading.Thread] = None
+        self._pipe_readers: Dict[str, _PipeReader] = {}
+
     def start_capture(self, session_id: str, process: subprocess.Popen) -> None:
         """Start capturing output from a process.
 
@@ -47,6 +108,14 @@ class OutputCapture:
 
             # Create buffered deque
             self.output_buffers[session_id] = deque(maxlen=self.output_buffer_size)
+            if process.stdout is not None:
+                self._encodings[session_id] = (
+                    getattr(process.stdout, "encoding", None) or "utf-8"
+                )
+
+            if _USE_SELECTOR and process.stdout is not None:
+                self._register_pipe(session_id, process)
+                return
 
             # Start capture thread
             output_thread = threading.Thread(
@@ -58,13 +127,22 @@ class OutputCapture:
             output_thread.start()
             self.output_threads[session_id] = output_thread
 
-    def stop_capture(self, session_id: str) -> None:
+    def stop_capture(self, session_id: str) -> List[str]:
         """Stop capturing output for a session.
 
         Args:
             session_id: Session to stop capturing
+
+        Returns:
+            All output captured for the session, including lines still
+            sitting in the pipe, so callers can archive it
         """
         with self._lock:
+            # Collect anything still sitting in the pipe before forgetting it
+            if session_id in self._pipe_readers:
+                self._drain_pipe(session_id)
+                self._unregister_pipe(session_id)
+
             # Clean up output thread
             if session_id in self.output_threads:
                 thread = self.output_threads[session_id]
@@ -73,15 +151,24 @@ class OutputCapture:
                 del self.output_threads[session_id]
 
             # Clean up output queue
-            if session_id in self.output_buffers:
-                del self.output_buffers[session_id]
-
-    def get_recent_output(self, session_id: str, lines: int = 50) -> List[str]:
+            captured: List[str] = []
+            buffer = self.output_buffers.pop(session_id, None)
+            if buffer is not None:
+                captured = self._decode_lines(session_id, buffer)
+            self._encodings.pop(session_id, None)
+            self._line_counts.pop(session_id, None)
+            return captured
+
+    def get_recent_output(
+        self, session_id: str, lines: int = 50, decode: bool = True
+    ) -> List[_Line]:
         """Get recent output lines from a session.
 
         Args:
             session_id: Session identifier
             lines: Maximum number of lines to return
+            decode: Decode captured lines; when False they are returned as
+                stored (see :meth:`get_encoding`)
 
         Returns:
             List of recent output lines (newest last)
@@ -91,8 +178,38 @@ class OutputCapture:
             if buffer is None:
                 return []
             if lines is None or lines >= len(buffer):
-                return list(buffer)
-            return list(buffer)[-lines:]
+                recent = list(buffer)
+            else:
+                # Walk only the requested tail instead of copying the whole buffer
+                recent = list(islice(reversed(buffer), max(lines, 0)))
+                recent.reverse()
+            if not decode:
+                return recent
+            return self._decode_lines(session_id, recent)
+
+    def read_recent_output(
+        self, session_id: str, lines: int
+    ) -> Tuple[List[_Line], int]:
+        """Get recent raw output lines and the position they end at.
+
+        Passing the position to :meth:`clear_output` later discards only
+        these lines and older ones, never lines captured in between.
+
+        Args:
+            session_id: Session identifier
+            lines: Maximum number of lines to return
+
+        Returns:
+            ``(lines as stored, output position)``
+        """
+        with self._lock:
+            recent = self.get_recent_output(session_id, lines, decode=False)
+            return recent, self._line_counts.get(session_id, 0)
+
+    def get_encoding(self, session_id: str) -> str:
+        """Get the encoding of a session's raw captured lines."""
+        with self._lock:
+            return self._encodings.get(session_id, "utf-8")
 
     def get_all_output(self, session_id: str) -> List[str]:
         """Get all captured output for a session.
@@ -107,7 +224,7 @@ class OutputCapture:
             buffer = self.output_buffers.get(session_id)
             if buffer is None:
                 return []
-            return list(buffer)
+            return self._decode_lines(session_id, buffer)
 
     def inject_output(self, text: str, session_id: Optional[str] = None) -> None:
         """Inject synthetic output lines for testing.
@@ -138,6 +255,9 @@ class OutputCapture:
                 if not cleaned:
                     continue
                 buf.append(cleaned)
+                self._line_counts[target_session_id] = (
+                    self._line_counts.get(target_session_id, 0) + 1
+                )
 
     def has_output(self, session_id: str) -> bool:
         """Check if there is any output available for a session.
@@ -165,11 +285,13 @@ class OutputCapture:
             buffer = self.output_buffers.get(session_id)
             return len(buffer) if buffer is not None else 0
 
-    def clear_output(self, session_id: str) -> int:
-        """Clear all output for a session.
+    def clear_output(self, session_id: str, until: Optional[int] = None) -> int:
+        """Clear output for a session.
 
         Args:
             session_id: Session identifier
+            until: Output position from :meth:`read_recent_output`; only
+                lines captured before it are cleared. None clears everything.
 
         Returns:
             Number of items cleared
@@ -178,40 +300,172 @@ class OutputCapture:
             buffer = self.output_buffers.get(session_id)
             if buffer is None:
                 return 0
-            count = len(buffer)
-            buffer.clear()
+            if until is None:
+                count = len(buffer)
+                buffer.clear()
+                return count
+            newer = self._line_counts.get(session_id, 0) - until
+            count = max(0, len(buffer) - max(0, newer))
+            for _ in range(count):
+                buffer.popleft()
             return count
 
+    def _decode_lines(self, session_id: str, lines: Iterable[_Line]) -> List[str]:
+        """Decode raw captured lines with the session's pipe encoding."""
+        encoding = self._encodings.get(session_id, "utf-8")
+        return [
+            line if isinstance(line, str) else line.decode(encoding, "replace")
+            for line in lines
+        ]
+
+    def _append_lines(self, session_id: str, lines: List[bytes]) -> int:
+        """Append cleaned, non-empty lines to a session buffer.
+
+        Returns:
+            Number of lines appended
+        """
+        buffer = self.output_buffers.get(session_id)
+        if buffer is None:
+            return 0
+        appended = 0
+        for line in lines:
+            line = line.strip()
+            if line:
+                buffer.append(line)
+                appended += 1
+        self._line_counts[session_id] = self._line_counts.get(session_id, 0) + appended
+        return appended
+
+    def _notify_output(self, session_id: str) -> None:
+        """Tell the listener a session has new output.
+
+        Must be called without holding ``_lock``: the listener typically
+        reads the output back from another thread's locks.
+        """
+        if self.on_output is None:
+            return
+        try:
+            self.on_output(session_id)
+        except Exception:
+            pass
+
+    def _register_pipe(self, session_id: str, process: subprocess.Popen) -> None:
+        """Start watching a process pipe from the shared selector thread."""
+        reader = _PipeReader(process)
+        os.set_blocking(reader.fd, False)
+
+        if self._selector is None:
+            self._selector = selectors.DefaultSelector()
+        self._pipe_readers[session_id] = reader
+        self._selector.register(reader.fd, selectors.EVENT_READ, data=session_id)
+
+        if self._selector_thread is None or not self._selector_thread.is_alive():
+            self._selector_thread = threading.Thread(
+                target=self._selector_loop,
+                daemon=True,
+                name="OutputCapture-selector",
+            )
+            self._selector_thread.start()
+
+    def _unregister_pipe(self, session_id: str) -> None:
+        """Stop watching a session pipe."""
+        reader = self._pipe_readers.pop(session_id, None)
+        if reader is None or self._selector is None:
+            return
+        try:
+            self._selector.unregister(reader.fd)
+        except (KeyError, ValueError, OSError):
+            pass
+
+    def _read_pipe(self, session_id: str) -> int:
+        """Read one chunk from a session pipe without blocking.
+
+        Returns:
+            Number of bytes read; 0 when nothing is available or at EOF,
+            in which case the pipe is flushed and unregistered
+        """
+        read, _ = self._read_pipe_lines(session_id)
+        return read
+
+    def _read_pipe_lines(self, session_id: str) -> Tuple[int, int]:
+        """Read one chunk from a session pipe without blocking.
+
+        Returns:
+            ``(bytes read, complete lines appended)``
+        """
+        reader = self._pipe_readers.get(session_id)
+        if reader is None:
+            return 0, 0
+
+        try:
+            data = os.read(reader.fd, _READ_SIZE)
+        except BlockingIOError:
+            return 0, 0
+        except OSError:
+            data = b""
+
+        if data:
+            return len(data), self._append_lines(session_id, reader.feed(data))
+
+        appended = self._append_lines(session_id, reader.flush())
+        self._unregister_pipe(session_id)
+        return 0, appended
+
+    def _drain_pipe(self, session_id: str) -> None:
+        """Read what is currently available from a session pipe (bounded)."""
+        for _ in range(_DRAIN_MAX_READS):
+            if not self._read_pipe(session_id):
+                break
+        reader = self._pipe_readers.get(session_id)
+        if reader is not None:
+            self._append_lines(session_id, reader.flush())
+
+    def _selector_loop(self) -> None:
+        """Dispatch readable pipes for all sessions from a single thread."""
+        while not self._shutdown_event.is_set():
+            selector = self._selector
+            if selector is None:
+                break
+            try:
+                events = selector.select(timeout=0.05)
+            except (OSError, ValueError):
+                # Selector closed or fd vanished underneath us
+                time.sleep(0.01)
+                continue
+
+            for key, _ in events:
+                with self._lock:
+                    _, appended = self._read_pipe_lines(key.data)
+                if appended:
+                    self._notify_output(key.data)
+
     def _capture_output(self, process: subprocess.Popen, session_id: str) -> None:
         """Capture output from a process in a separate thread.
 
+        Used where pipes cannot be registered with a selector (Windows). The
+        pipe is read in large blocking chunks rather than line by line.
+
         Args:
             process: Subprocess to capture from
-            output_queue: Queue to store output lines
             session_id: Session identifier for logging
         """
         try:
-            while True:
-                # Check if we should shutdown
-                if self._shutdown_event.is_set():
+            reader = _PipeReader(process)
+            while not self._shutdown_event.is_set():
+                data = os.read(reader.fd, _READ_SIZE)
+                if not data:
                     break
-
-                # Read line from process
-                line = process.stdout.readline()
-                if not line:
-                    # Check if process has terminated
-                    if process.poll() is not None:
-                        break
-                    time.sleep(0.01)
-                    continue
-
-                # Add line to queue
-                line = line.strip()
-                if line:
+                lines = reader.feed(data)
+                if lines:
                     with self._lock:
-                        buffer = self.output_buffers.get(session_id)
-                        if buffer is not None:
-                            buffer.append(line)
+                        appended = self._append_lines(session_id, lines)
+                    if appended:
+                        self._notify_output(session_id)
+
+            with self._lock:
+                appended = self._append_lines(session_id, reader.flush())
+            if appended:
+                self._notify_output(session_id)
 
         except Exception:
             # Thread will exit on any error
@@ -226,6 +480,10 @@ class OutputCapture:
             for session_id in session_ids:
                 self.stop_capture(session_id)
 
+            if self._selector is not None:
+                self._selector.close()
+                self._selector = None
+
     def __del__(self):
         """Cleanup when service is destroyed."""
         try:
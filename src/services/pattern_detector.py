@@ -4,17 +4,107 @@ Handles real-time detection of usage limit messages from Claude Code output
 using configurable regex patterns with confidence scoring and context capture.
 """
 
+import math
 import re
 import threading
 import time
 from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Pattern
+from functools import lru_cache
+from itertools import islice
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Match,
+    Optional,
+    Pattern,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+try:  # Optional literal-pattern accelerator (pip install ".[performance]")
+    import ahocorasick
+except ImportError:  # pragma: no cover - depends on installed extras
+    ahocorasick = None
+
+try:
+    from re import _parser as _regex_parser  # Python 3.11+
+except ImportError:  # pragma: no cover - Python < 3.11
+    import sre_parse as _regex_parser  # type: ignore[no-redef]
 
 from ..models.limit_detection_event import LimitDetectionEvent
 from ..models.system_configuration import SystemConfiguration
 
+# Numbered or named backreferences break when patterns are wrapped in groups
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+# Words every heuristic / fast-phrase detection contains (see
+# _check_line_for_patterns and _heuristic_detection)
+_HEURISTIC_ANCHORS = ("limit", "quota", "wait")
+
+# Extra room kept in the streaming window beyond the longest pattern
+_STREAM_WINDOW_SLACK = 4096
+
+# Keyword sets used by _calculate_confidence
+_STRONG_KEYWORDS = (
+    "usage limit exceeded",
+    "rate limit",
+    "limit exceeded",
+    "please wait",
+    "quota exceeded",
+    "cooldown",
+    "temporarily disabled",
+    "locked for",
+)
+_SUPPORTING_KEYWORDS = ("wait", "hours", "exceeded", "quota", "limit")
+_ERROR_INDICATORS = ("error", "warning", "alert", "failed", "denied")
+_GENERIC_MATCHES = frozenset({"limit", "usage limit", "wait"})
+_LIMIT_HIT_WORDS = ("reached", "exceeded", "hit")
+_NEUTRAL_TERMS = ("configuration", "setting", "updated", "requested")
+_ALL_KEYWORDS = tuple(
+    dict.fromkeys(
+        _STRONG_KEYWORDS
+        + _SUPPORTING_KEYWORDS
+        + _ERROR_INDICATORS
+        + _LIMIT_HIT_WORDS
+        + _NEUTRAL_TERMS
+        + ("limit",)
+    )
+)
+# Markers of system/debug output that is never a limit message, matched
+# anywhere in the lowercased line
+_SYSTEM_MESSAGE = re.compile(
+    "|".join(
+        re.escape(indicator)
+        for indicator in (
+            "[debug]",
+            "[info]",
+            "[warn]",
+            "[error]",
+            "[trace]",
+            "claude-code:",
+            "system:",
+            "debug:",
+            "log:",
+            "timestamp:",
+            "process id:",
+            "thread:",
+            "memory:",
+            "loading",
+            "initializing",
+            "connecting",
+        )
+    )
+)
+_HOURS_REFERENCE = re.compile(r"\b\d+\s*hours?\b")
+_NUMBER_REFERENCE = re.compile(r"\b\d+\b")
+
 
 @dataclass
 class DetectionResult:
@@ -29,6 +119,319 @@ class DetectionResult:
     context_after: Optional[str] = None
 
 
+class _PatternScanner:
+    """Compiled, read-only view of one pattern set.
+
+    Built by :func:`_build_scanner` and shared between every detector that
+    uses the same compiled patterns and flags, so the combined union, the
+    probe regex and the optional accelerator are built once per pattern set.
+    """
+
+    def __init__(self, compiled: Tuple[Pattern, ...], flags: int):
+        self.flags = flags
+        self.compiled = compiled
+
+        self.stream_window = _STREAM_WINDOW_SLACK + max(
+            (len(p.pattern) for p in self.compiled), default=0
+        )
+        self.base_confidence = [_base_confidence(p.pattern) for p in self.compiled]
+
+        self.probe_regex, self.probe_width = self._build_probe_regex()
+        self.union = self._build_union()
+        self.match_widths = [self._match_width(p.pattern) for p in self.compiled]
+        self.search_order, self.remaining_width = self._build_search_order()
+        self.regex_indices: List[int] = []
+        self.literal_automaton = self._build_literal_automaton()
+
+    def _build_probe_regex(self) -> Tuple[Optional[Pattern], int]:
+        """Compile the literals at least one of which any detection contains.
+
+        Each pattern contributes its longest required literal; the heuristic
+        fallback contributes its anchor words. The probes are joined into one
+        case-insensitive alternation, returned with the longest probe's
+        length. Returns None (no prefilter) when some pattern has no required
+        literal, e.g. ``.*`` or ``a|b``.
+
+        Probes are casefolded and matched against casefolded text: an
+        IGNORECASE alternation of many literals is far slower in ``re``.
+        """
+        probes = set(_HEURISTIC_ANCHORS)
+        for compiled in self.compiled:
+            literal = _required_literal(compiled.pattern, self.flags)
+            if not literal:
+                return None, 0
+            probes.add(literal.casefold())
+        ordered = sorted(probes, key=len, reverse=True)
+        alternation = "|".join(re.escape(probe) for probe in ordered)
+        return re.compile(alternation), len(ordered[0])
+
+    def _match_width(self, pattern: str) -> Optional[int]:
+        """Return the longest text a pattern can match, None if unbounded."""
+        try:
+            width = _regex_parser.parse(pattern, self.flags).getwidth()
+        except Exception:
+            return None
+        if width[1] >= _regex_parser.MAXREPEAT:
+            return None
+        return width[1]
+
+    def _build_search_order(self) -> Tuple[List[int], List[float]]:
+        """Order pattern indices most specific first for per-line checks.
+
+        Specificity is the number of top-level literal characters, so the
+        pattern most likely to win on a matching line is tried first. Also
+        returns, for each position in that order, the longest match any
+        pattern from there on can produce (``inf`` if unbounded), which tells
+        the caller when no remaining pattern can beat the current best.
+        """
+        literal_counts = [_literal_count(p.pattern, self.flags) for p in self.compiled]
+        order = sorted(
+            range(len(self.compiled)), key=lambda index: -literal_counts[index]
+        )
+        remaining: List[float] = [0.0] * (len(order) + 1)
+        for position in range(len(order) - 1, -1, -1):
+            width = self.match_widths[order[position]]
+            remaining[position] = max(
+                remaining[position + 1], math.inf if width is None else width
+            )
+        return order, remaining
+
+    def has_probe(self, text: str, start: int = 0) -> bool:
+        """Check whether ``text[start:]`` contains a probe literal.
+
+        Always True when there is no prefilter.
+        """
+        if self.probe_regex is None:
+            return True
+        tail = text[start:]
+        folded = tail.lower() if tail.isascii() else tail.casefold()
+        return self.probe_regex.search(folded) is not None
+
+    def candidate_lines(self, text: str) -> Optional[List[int]]:
+        """Return indices of the newline-separated lines worth checking.
+
+        A single scan over the whole text finds every probe hit, and the line
+        of each hit is recovered by counting newlines between hits. Returns
+        None when there is no prefilter (every line is a candidate).
+        """
+        if self.probe_regex is None:
+            return None
+
+        # Folding never adds or removes newlines, so line indices carry over
+        folded = text.lower() if text.isascii() else text.casefold()
+        indices: List[int] = []
+        line_index = 0
+        previous = 0
+        for match in self.probe_regex.finditer(folded):
+            line_index += folded.count("\n", previous, match.start())
+            previous = match.start()
+            if not indices or indices[-1] != line_index:
+                indices.append(line_index)
+        return indices
+
+    def _build_union(self) -> Optional[Pattern]:
+        """Combine all patterns into one alternation, most specific first.
+
+        Branches are ordered by descending pattern length, so at any position
+        the longer (more specific) pattern wins, and each branch is a named
+        group ``p<index>`` that maps a match back to its pattern. Returns None
+        when a pattern uses backreferences (group numbers would shift) or the
+        combined expression does not compile.
+        """
+        if not self.compiled:
+            return None
+        if any(_BACKREFERENCE.search(p.pattern) for p in self.compiled):
+            return None
+
+        order = sorted(
+            range(len(self.compiled)),
+            key=lambda index: -len(self.compiled[index].pattern),
+        )
+        branches = "|".join(
+            f"(?P<p{index}>{self.compiled[index].pattern})" for index in order
+        )
+        try:
+            return re.compile(branches, self.flags)
+        except re.error:
+            return None
+
+    def _build_literal_automaton(self) -> Optional[Any]:
+        """Build an Aho-Corasick automaton over the patterns' required literals.
+
+        Each pattern is keyed by its longest required literal (the whole
+        pattern for plain literals), so one pass over the text finds every
+        pattern that can possibly match. Patterns without an ASCII required
+        literal (``.*``, alternations, Korean or Chinese text) are tracked in
+        ``regex_indices`` and always remain candidates. Keys and text are
+        casefolded, and every candidate is confirmed by ``re`` on the ``str``.
+        """
+        if ahocorasick is None:
+            return None
+
+        automaton = ahocorasick.Automaton()
+        literal_indices: Set[int] = set()
+        for index, compiled in enumerate(self.compiled):
+            literal = _required_literal(compiled.pattern, self.flags)
+            if not literal or not literal.isascii():
+                continue
+            key = literal.casefold()
+            automaton.add_word(key, automaton.get(key, ()) + (index,))
+            literal_indices.add(index)
+
+        if not literal_indices:
+            return None
+
+        automaton.make_automaton()
+        self.regex_indices = [
+            index for index in range(len(self.compiled)) if index not in literal_indices
+        ]
+        return automaton
+
+    def candidate_indices(self, text: str) -> Sequence[int]:
+        """Return indices of compiled patterns that may match ``text``.
+
+        Without the accelerator every pattern is a candidate; otherwise the
+        Aho-Corasick automaton narrows the patterns with a required literal.
+        Candidates are returned in pattern order and confirmed with ``re`` by
+        the caller.
+        """
+        if self.literal_automaton is None:
+            return range(len(self.compiled))
+
+        # Keys are ASCII, so plain lower() suffices for ASCII text
+        haystack = text.lower() if text.isascii() else text.casefold()
+        candidates = set(self.regex_indices)
+        for _, indices in self.literal_automaton.iter(haystack):
+            candidates.update(indices)
+        return sorted(candidates)
+
+    def iter_block_matches(self, text: str) -> Iterator[Tuple[int, Match]]:
+        """Yield ``(pattern index, first match)`` pairs for a text block.
+
+        The union only decides whether any pattern can match; each candidate
+        is then searched on its own, because one alternation never reports a
+        match that lies inside another branch's match.
+        """
+        candidates = self.candidate_indices(text)
+        if self.union is not None and len(candidates) > 1:
+            if not self.union.search(text):
+                return
+        for index in candidates:
+            match = self.compiled[index].search(text)
+            if match:
+                yield index, match
+
+
+def _literal_count(pattern: str, flags: int) -> int:
+    """Return how many top-level literal characters ``pattern`` contains."""
+    try:
+        parsed = _regex_parser.parse(pattern, flags)
+    except Exception:
+        return 0
+    return sum(1 for op, _ in parsed if op == _regex_parser.LITERAL)
+
+
+def _required_literal(pattern: str, flags: int) -> str:
+    """Return the longest literal run every match of ``pattern`` contains.
+
+    Only top-level literal runs are considered, which is conservative: an
+    empty string means no literal is guaranteed to appear.
+    """
+    try:
+        parsed = _regex_parser.parse(pattern, flags)
+    except Exception:
+        return ""
+
+    best = ""
+    current: List[str] = []
+    for op, value in parsed:
+        if op == _regex_parser.LITERAL:
+            current.append(chr(value))
+            continue
+        if len(current) > len(best):
+            best = "".join(current)
+        current = []
+    if len(current) > len(best):
+        best = "".join(current)
+    return best
+
+
+def _brackets_balanced(pattern: str) -> bool:
+    """Cheaply check that a pattern's groups and character sets are closed.
+
+    A False result means ``re.compile`` would certainly fail, so malformed
+    patterns can be rejected without running the parser. Escapes and the
+    contents of ``[...]`` are skipped; patterns that may contain comments
+    (``(?#...)`` or verbose ``#``) are not checked.
+    """
+    if "#" in pattern:
+        return True
+    depth = 0
+    in_set = False
+    index = 0
+    length = len(pattern)
+    while index < length:
+        char = pattern[index]
+        index += 1
+        if char == "\\":
+            index += 1
+        elif in_set:
+            in_set = char != "]"
+        elif char == "[":
+            in_set = True
+            # A "]" right after "[" or "[^" is a literal member of the set
+            if pattern.startswith("^", index):
+                index += 1
+            if pattern.startswith("]", index):
+                index += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            if not depth:
+                return False
+            depth -= 1
+    return not depth and not in_set
+
+
+def _decode(text: Union[str, bytes], encoding: str) -> str:
+    """Decode raw output, replacing undecodable bytes."""
+    if isinstance(text, bytes):
+        return text.decode(encoding, "replace")
+    return text
+
+
+@lru_cache(maxsize=256)
+def _base_confidence(pattern: str) -> float:
+    """Return the part of a match's confidence that depends only on the pattern.
+
+    Longer patterns are more specific, so they start from a higher score.
+    """
+    confidence = 0.3  # Base confidence lower to avoid false positives
+    if len(pattern) >= 25:
+        confidence += 0.25
+    elif len(pattern) >= 15:
+        confidence += 0.15
+    elif len(pattern) >= 8:
+        confidence += 0.05
+    return confidence
+
+
+@lru_cache(maxsize=256)
+def _compile_cached(pattern: str, flags: int) -> Pattern:
+    """Compile a detection pattern once per pattern string and flags.
+
+    ``re.error`` propagates and is not cached, so an invalid pattern is
+    rejected again on every attempt.
+    """
+    return re.compile(pattern, flags)
+
+
+@lru_cache(maxsize=64)
+def _build_scanner(compiled: Tuple[Pattern, ...], flags: int) -> _PatternScanner:
+    """Return the shared scanner for a pattern set, building it on first use."""
+    return _PatternScanner(compiled, flags)
+
+
 class PatternDetector:
     """Service for detecting Claude Code usage limit patterns."""
 
@@ -47,42 +450,88 @@ class PatternDetector:
         self.output_buffer: deque = deque(maxlen=100)
         self.line_number = 0
 
-        # Detection history
-        self.detection_history: List[LimitDetectionEvent] = []
+        # Unterminated tail of the streamed output (see process_chunk), how
+        # much of it has been searched for probes, and whether one was found
+        self._partial_line = ""
+        self._scan_pos = 0
+        self._partial_has_probe = False
+
+        # Detection history (bounded for long-running monitors)
+        self.detection_history: Deque[LimitDetectionEvent] = deque(
+            maxlen=config.monitoring.get("detection_history_size", 10000)
+        )
         self.last_detection_time: Optional[datetime] = None
 
+        # Repeats of the same match inside this window reuse the first event
+        self.dedup_seconds = float(config.monitoring.get("detection_dedup_seconds", 0))
+        self._recent_detections: Dict[
+            Tuple[Optional[str], Optional[str]], Tuple[float, LimitDetectionEvent]
+        ] = {}
+
         # Performance tracking
         self.detection_count = 0
+        # Detections since the history was last cleared; unlike the history
+        # itself this is not capped by detection_history_size
+        self._history_total = 0
         self.total_processing_time = 0.0
+        self._stats_cache: Optional[Tuple[Tuple[Any, ...], Dict[str, Any]]] = None
 
         # Thread safety
         self._lock = threading.RLock()
 
     def _compile_patterns(self) -> None:
-        """Compile regex patterns for efficient matching."""
-        self.compiled_patterns.clear()
+        """Compile regex patterns for efficient matching.
+
+        All patterns share ``self._flags`` (MULTILINE | DOTALL, plus IGNORECASE
+        unless case-sensitive), so one search spans a multi-line block and
+        add_pattern/test_pattern validate exactly what detection runs. The
+        compiled scanner is cached per pattern set and flags.
+        """
         flags = re.MULTILINE | re.DOTALL
         if not self.case_sensitive:
             flags |= re.IGNORECASE
+        self._flags = flags
 
+        # Patterns compiled before (by any detector) come from the cache
+        compiled: List[Pattern] = []
         for pattern in self.detection_patterns:
             try:
-                compiled = re.compile(pattern, flags)
-                self.compiled_patterns.append(compiled)
+                compiled.append(_compile_cached(pattern, flags))
             except re.error as e:
                 # Log error but continue with other patterns
                 print(f"Warning: Invalid regex pattern '{pattern}': {e}")
 
-    def detect_limit_message(self, text: str) -> Optional[LimitDetectionEvent]:
+        self._scanner = _build_scanner(tuple(compiled), flags)
+        self.compiled_patterns = compiled
+        self._stream_window = self._scanner.stream_window
+        # New patterns bring new probes; search the partial line again
+        self._reset_partial_scan()
+
+    def _candidate_indices(self, text: str) -> Sequence[int]:
+        """Return indices of compiled patterns that may match ``text``."""
+        return self._scanner.candidate_indices(text)
+
+    def _iter_block_matches(self, text: str) -> Iterator[Tuple[int, Match]]:
+        """Yield ``(pattern index, first match)`` pairs for a text block."""
+        return self._scanner.iter_block_matches(text)
+
+    def detect_limit_message(
+        self, text: Union[str, bytes], encoding: str = "utf-8"
+    ) -> Optional[LimitDetectionEvent]:
         """
         Detect usage limit messages in text.
 
+        Raw output bytes are decoded in full on entry, before any
+        screening: every line is kept in the output buffer for context.
+
         Args:
-            text: Text to analyze for limit patterns
+            text: Text to analyze for limit patterns, or raw output bytes
+            encoding: Encoding used to decode bytes input
 
         Returns:
             LimitDetectionEvent if limit detected, None otherwise
         """
+        text = _decode(text, encoding)
         start_time = time.time()
 
         try:
@@ -96,15 +545,21 @@ class PatternDetector:
                     self.output_buffer.append((self.line_number, cleaned))
                     line_records.append((self.line_number, cleaned))
 
+                # Only lines containing a probe literal can match; none at all
+                # means the block scan can be skipped too
+                candidates = self._scanner.candidate_lines(text)
+                if candidates is not None:
+                    if not candidates:
+                        return None
+                    line_records_to_check = [line_records[i] for i in candidates]
+                else:
+                    line_records_to_check = line_records
+
                 # Check each line for patterns
-                for line_num, line in line_records:
+                for line_num, line in line_records_to_check:
                     result = self._check_line_for_patterns(line, line_num)
                     if result.matched:
-                        event = self._create_detection_event(result)
-                        self.detection_history.append(event)
-                        self.detection_count += 1
-                        self.last_detection_time = datetime.now()
-                        return event
+                        return self._record_detection(result)
 
                 # Fallback: check entire text block for multi-line matches
                 if line_records:
@@ -112,11 +567,7 @@ class PatternDetector:
                         text, line_records[-1][0]
                     )
                     if block_result and block_result.matched:
-                        event = self._create_detection_event(block_result)
-                        self.detection_history.append(event)
-                        self.detection_count += 1
-                        self.last_detection_time = datetime.now()
-                        return event
+                        return self._record_detection(block_result)
 
                 return None
 
@@ -131,8 +582,8 @@ class PatternDetector:
         Performance optimizations:
         - Early return on empty lines
         - Skip system messages before pattern matching
-        - Early exit when high-confidence match found (>0.9)
-        - Patterns ordered by priority (earlier = more specific)
+        - Patterns tried most specific first (see ``search_order``); the
+          search stops once no remaining pattern can beat a 1.0 match
         """
         if not line.strip():
             return DetectionResult(matched=False)
@@ -164,29 +615,52 @@ class PatternDetector:
         best_confidence = 0.0
         confidence_threshold = self.config.monitoring.get("confidence_threshold", 0.5)
 
-        for i, pattern in enumerate(self.compiled_patterns):
+        candidates = self._candidate_indices(line)
+        union = self._scanner.union
+        if union is not None and len(candidates) > 1 and not union.search(line):
+            # One combined search rules out every pattern at once
+            candidates = ()
+
+        # Most specific patterns first; ties go to the earlier pattern, so the
+        # result is the same as checking every candidate in list order
+        scanner = self._scanner
+        candidate_set = set(candidates)
+        best_index = -1
+        best_text = ""
+        for position, i in enumerate(scanner.search_order):
+            longest_left = scanner.remaining_width[position]
+            if best_confidence >= 1.0 and longest_left < len(best_text):
+                break  # No remaining pattern can outscore or outlast the best
+            if i not in candidate_set:
+                continue
+            pattern = self.compiled_patterns[i]
             match = pattern.search(line)
-            if match:
-                confidence = self._calculate_confidence(
-                    pattern.pattern, match.group(), line, i
-                )
-
-                if confidence > best_confidence or (
-                    confidence == best_confidence
-                    and len(match.group()) > len(best_match.matched_text or "")
-                ):
-                    best_confidence = confidence
-                    best_match = DetectionResult(
-                        matched=True,
-                        pattern=pattern.pattern,
-                        matched_text=match.group(),
-                        confidence=confidence,
-                        line_number=line_number,
-                        context_before=self._get_context_before(line_number),
-                        context_after=self._get_context_after(line_number),
-                    )
+            if not match:
+                continue
 
-                    # Continue checking remaining patterns to prefer more specific matches
+            matched_text = match.group()
+            confidence = self._calculate_confidence(
+                pattern.pattern, matched_text, line, i
+            )
+            if (confidence, len(matched_text)) > (best_confidence, len(best_text)) or (
+                confidence == best_confidence
+                and len(matched_text) == len(best_text)
+                and best_index > i
+            ):
+                best_confidence = confidence
+                best_text = matched_text
+                best_index = i
+
+        if best_index >= 0:
+            best_match = DetectionResult(
+                matched=True,
+                pattern=self.compiled_patterns[best_index].pattern,
+                matched_text=best_text,
+                confidence=best_confidence,
+                line_number=line_number,
+                context_before=self._get_context_before(line_number),
+                context_after=self._get_context_after(line_number),
+            )
 
         # Only return matches above confidence threshold
         if best_match.matched and best_match.confidence >= confidence_threshold:
@@ -253,11 +727,8 @@ class PatternDetector:
         best_confidence = 0.0
         confidence_threshold = self.config.monitoring.get("confidence_threshold", 0.5)
 
-        for idx, pattern in enumerate(self.compiled_patterns):
-            match = pattern.search(text)
-            if not match:
-                continue
-
+        for idx, match in self._iter_block_matches(text):
+            pattern = self.compiled_patterns[idx]
             confidence = self._calculate_confidence(
                 pattern.pattern, match.group(), text, idx
             )
@@ -293,67 +764,55 @@ class PatternDetector:
         self, pattern: str, matched_text: str, full_line: str, pattern_index: int
     ) -> float:
         """Calculate confidence score for a pattern match."""
-        confidence = 0.3  # Base confidence lower to avoid false positives
+        # The pattern-only part is precomputed per index; ad-hoc patterns
+        # (test_pattern) are not in the scanner's set
+        scanner = self._scanner
+        if (
+            pattern_index < len(scanner.compiled)
+            and scanner.compiled[pattern_index].pattern == pattern
+        ):
+            confidence = scanner.base_confidence[pattern_index]
+        else:
+            confidence = _base_confidence(pattern)
 
         normalized_line = full_line.lower()
         normalized_match = matched_text.lower()
 
-        # Pattern specificity bonus based on length
-        if len(pattern) >= 25:
-            confidence += 0.25
-        elif len(pattern) >= 15:
-            confidence += 0.15
-        elif len(pattern) >= 8:
-            confidence += 0.05
+        # One pass over the keyword list; the checks below are set lookups
+        present = {keyword for keyword in _ALL_KEYWORDS if keyword in normalized_line}
 
         # Strong signal keywords heavily boost confidence
-        strong_keywords = [
-            "usage limit exceeded",
-            "rate limit",
-            "limit exceeded",
-            "please wait",
-            "quota exceeded",
-            "cooldown",
-            "temporarily disabled",
-            "locked for",
-        ]
-        if any(keyword in normalized_line for keyword in strong_keywords):
+        if not present.isdisjoint(_STRONG_KEYWORDS):
             confidence += 0.4
 
         # Supporting keywords add moderate confidence
-        supporting_keywords = ["wait", "hours", "exceeded", "quota", "limit"]
-        supporting_hits = sum(
-            1 for keyword in supporting_keywords if keyword in normalized_line
-        )
+        supporting_hits = len(present.intersection(_SUPPORTING_KEYWORDS))
         confidence += min(0.2, supporting_hits * 0.05)
 
         # Time and numeric references
-        if re.search(r"\b\d+\s*hours?\b", normalized_line):
+        if "hour" in normalized_line and _HOURS_REFERENCE.search(normalized_line):
             confidence += 0.2
-        elif re.search(r"\b\d+\b", normalized_line):
+        elif _NUMBER_REFERENCE.search(normalized_line):
             confidence += 0.1
 
         # Error/warning context bonus
-        error_indicators = ["error", "warning", "alert", "failed", "denied"]
-        if any(indicator in normalized_line for indicator in error_indicators):
+        if not present.isdisjoint(_ERROR_INDICATORS):
             confidence += 0.1
 
         # Penalize generic matches without strong context
-        if normalized_match.strip() in {"limit", "usage limit", "wait"}:
+        limit_hit = not present.isdisjoint(_LIMIT_HIT_WORDS)
+        if normalized_match.strip() in _GENERIC_MATCHES:
             confidence -= 0.2
-            if any(word in normalized_line for word in ["reached", "exceeded", "hit"]):
+            if limit_hit:
                 confidence += 0.3
         else:
             confidence = max(confidence, 0.6)
 
-        if "limit" in normalized_line and any(
-            word in normalized_line for word in ["reached", "exceeded", "hit"]
-        ):
+        if limit_hit and "limit" in present:
             confidence = max(confidence, 0.6)
 
         # Penalize if text references configuration/settings
-        neutral_terms = ["configuration", "setting", "updated", "requested"]
-        if any(term in normalized_line for term in neutral_terms):
+        if not present.isdisjoint(_NEUTRAL_TERMS):
             confidence -= 0.1
 
         # Ensure confidence remains within bounds
@@ -361,27 +820,7 @@ class PatternDetector:
 
     def _is_system_message(self, line: str) -> bool:
         """Check if line is a system message that should be ignored."""
-        system_indicators = [
-            "[DEBUG]",
-            "[INFO]",
-            "[WARN]",
-            "[ERROR]",
-            "[TRACE]",
-            "claude-code:",
-            "system:",
-            "debug:",
-            "log:",
-            "timestamp:",
-            "process id:",
-            "thread:",
-            "memory:",
-            "loading",
-            "initializing",
-            "connecting",
-        ]
-
-        line_lower = line.lower().strip()
-        return any(indicator.lower() in line_lower for indicator in system_indicators)
+        return _SYSTEM_MESSAGE.search(line.lower()) is not None
 
     def _get_context_before(self, line_number: int, lines: int = 3) -> str:
         """Get context lines before the matched line."""
@@ -401,6 +840,39 @@ class PatternDetector:
 
         return "\n".join(context_lines)
 
+    def _record_detection(self, result: DetectionResult) -> LimitDetectionEvent:
+        """Add a detection to history, reusing the event for recent repeats."""
+        if self.dedup_seconds <= 0:
+            event = self._create_detection_event(result)
+            self._append_detection(event)
+            return event
+
+        now = time.monotonic()
+        key = (result.pattern, result.matched_text)
+        cached = self._recent_detections.get(key)
+        if cached is not None and now - cached[0] < self.dedup_seconds:
+            return cached[1]
+
+        event = self._create_detection_event(result)
+        self._append_detection(event)
+        self._recent_detections[key] = (now, event)
+
+        # Drop expired entries so the index stays as bounded as the history
+        if len(self._recent_detections) > (self.detection_history.maxlen or 0):
+            self._recent_detections = {
+                k: v
+                for k, v in self._recent_detections.items()
+                if now - v[0] < self.dedup_seconds
+            }
+        return event
+
+    def _append_detection(self, event: LimitDetectionEvent) -> None:
+        """Append a new event to the history and update counters."""
+        self.detection_history.append(event)
+        self.detection_count += 1
+        self._history_total += 1
+        self.last_detection_time = datetime.now()
+
     def _create_detection_event(self, result: DetectionResult) -> LimitDetectionEvent:
         """Create a LimitDetectionEvent from detection result."""
         return LimitDetectionEvent(
@@ -424,30 +896,69 @@ class PatternDetector:
         Returns:
             LimitDetectionEvent if limit detected in chunk
         """
-        # For streaming, we need to handle partial lines
-        if not hasattr(self, "_partial_line"):
-            self._partial_line = ""
-
-        self._partial_line += chunk
+        # Complete lines are detected one by one; only the unterminated tail is
+        # carried over, capped so a stream without newlines stays bounded.
+        *lines, self._partial_line = (self._partial_line + chunk).split("\n")
+        if lines:
+            self._reset_partial_scan()
+        if len(self._partial_line) > self._stream_window:
+            dropped = len(self._partial_line) - self._stream_window
+            self._partial_line = self._partial_line[dropped:]
+            if self._partial_has_probe:
+                # The probe found earlier may have been dropped
+                self._reset_partial_scan()
+            else:
+                self._scan_pos = max(0, self._scan_pos - dropped)
 
-        # Process complete lines
-        while "\n" in self._partial_line:
-            line, self._partial_line = self._partial_line.split("\n", 1)
+        for index, line in enumerate(lines):
             detection = self.detect_limit_message(line)
             if detection:
+                # Keep unprocessed lines for the next chunk
+                self._partial_line = "\n".join(
+                    lines[index + 1 :] + [self._partial_line]
+                )
+                self._reset_partial_scan()
                 return detection
 
         # Check if partial line might contain a pattern (for immediate detection)
         if len(self._partial_line) > 20:  # Only check substantial partial lines
+            if not self._partial_line_may_match():
+                self._scan_pos = len(self._partial_line)
+                return None
             temp_detection = self.detect_limit_message(self._partial_line)
             if (
                 temp_detection and temp_detection.confidence > 0.8
             ):  # High confidence only
                 self._partial_line = ""  # Clear to avoid duplicate detection
+                self._reset_partial_scan()
                 return temp_detection
+            self._scan_pos = len(self._partial_line)
 
         return None
 
+    def _reset_partial_scan(self) -> None:
+        """Forget how much of the partial line has been searched."""
+        self._scan_pos = 0
+        self._partial_has_probe = False
+
+    def _partial_line_may_match(self) -> bool:
+        """Check whether the streamed tail is worth a detection pass.
+
+        Nothing can change until new text arrives. After that, the whole
+        tail must be re-evaluated, because fast phrases and heuristics look
+        at the entire line, not only at a pattern match in the new text.
+        Every detection contains one of the probe literals, so the probe
+        search resumes at ``_scan_pos`` (less the longest probe, for one
+        straddling the old end) until a probe is found.
+        """
+        partial = self._partial_line
+        if self._scan_pos >= len(partial):
+            return False
+        if not self._partial_has_probe:
+            start = max(0, self._scan_pos - self._scanner.probe_width + 1)
+            self._partial_has_probe = self._scanner.has_probe(partial, start)
+        return self._partial_has_probe
+
     def update_patterns(self, new_patterns: List[str]) -> None:
         """
         Update detection patterns during runtime.
@@ -456,6 +967,8 @@ class PatternDetector:
             new_patterns: New list of regex patterns
         """
         with self._lock:
+            if new_patterns == self.detection_patterns:
+                return
             self.detection_patterns = new_patterns.copy()
             self._compile_patterns()
 
@@ -469,8 +982,10 @@ class PatternDetector:
         Returns:
             True if pattern was added successfully
         """
+        if not _brackets_balanced(pattern):
+            return False
         try:
-            re.compile(pattern, 0 if self.case_sensitive else re.IGNORECASE)
+            _compile_cached(pattern, self._flags)
             with self._lock:
                 if pattern not in self.detection_patterns:
                     self.detection_patterns.append(pattern)
@@ -511,37 +1026,81 @@ class PatternDetector:
         """
         with self._lock:
             if limit is None:
-                return self.detection_history.copy()
-            return self.detection_history[-limit:] if limit > 0 else []
+                return list(self.detection_history)
+            if limit <= 0:
+                return []
+            recent = list(islice(reversed(self.detection_history), limit))
+            recent.reverse()
+            return recent
 
     def clear_history(self) -> None:
-        """Clear detection history."""
+        """Clear detection history.
+
+        ``total_detections`` in the statistics restarts from zero.
+        """
+        with self._lock:
+            self.detection_history.clear()
+            self._recent_detections.clear()
+            self._history_total = 0
+
+    def reset_state(self) -> None:
+        """Forget processed output, history and counters.
+
+        Compiled patterns are kept, so a detector can be reused for a new
+        stream without recompiling.
+        """
         with self._lock:
+            self.output_buffer.clear()
+            self.line_number = 0
+            self._partial_line = ""
+            self._reset_partial_scan()
             self.detection_history.clear()
+            self._recent_detections.clear()
+            self.last_detection_time = None
+            self.detection_count = 0
+            self._history_total = 0
+            self.total_processing_time = 0.0
+            self._stats_cache = None
 
     def get_statistics(self) -> Dict[str, Any]:
-        """Get detection statistics."""
+        """Get detection statistics.
+
+        The counter-derived figures are rebuilt only when a detection or a
+        new line changes them, so frequent polling stays cheap; the timing
+        figure changes on every detection call and is filled in on read.
+        """
         with self._lock:
-            avg_processing_time = (
-                self.total_processing_time / max(1, self.detection_count)
+            key = (
+                self.detection_count,
+                self._history_total,
+                len(self.detection_patterns),
+                self.line_number,
+                len(self.output_buffer),
+            )
+            if self._stats_cache is None or self._stats_cache[0] != key:
+                self._stats_cache = (key, self._build_statistics())
+            stats = dict(self._stats_cache[1])
+            stats["average_processing_time_ms"] = (
+                self.total_processing_time / self.detection_count * 1000
                 if self.detection_count > 0
                 else 0.0
             )
-
-            return {
-                "total_detections": len(self.detection_history),
-                "patterns_count": len(self.detection_patterns),
-                "lines_processed": self.line_number,
-                "average_processing_time_ms": avg_processing_time * 1000,
-                "last_detection": (
-                    self.last_detection_time.isoformat()
-                    if self.last_detection_time
-                    else None
-                ),
-                "buffer_size": len(self.output_buffer),
-                "detection_rate": len(self.detection_history)
-                / max(1, self.line_number),
-            }
+            return stats
+
+    def _build_statistics(self) -> Dict[str, Any]:
+        """Compute the counter-derived statistics returned by get_statistics."""
+        return {
+            "total_detections": self._history_total,
+            "patterns_count": len(self.detection_patterns),
+            "lines_processed": self.line_number,
+            "last_detection": (
+                self.last_detection_time.isoformat()
+                if self.last_detection_time
+                else None
+            ),
+            "buffer_size": len(self.output_buffer),
+            "detection_rate": self._history_total / max(1, self.line_number),
+        }
 
     def test_pattern(self, pattern: str, test_text: str) -> DetectionResult:
         """
@@ -555,8 +1114,7 @@ class PatternDetector:
             DetectionResult with match information
         """
         try:
-            flags = 0 if self.case_sensitive else re.IGNORECASE
-            compiled_pattern = re.compile(pattern, flags)
+            compiled_pattern = _compile_cached(pattern, self._flags)
             match = compiled_pattern.search(test_text)
 
             if match:
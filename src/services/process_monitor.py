@@ -1,15 +1,15 @@
 """ProcessMonitor service - Orchestrator for process management services."""
 
 import os
-import subprocess
 import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import psutil
 
 from ..exceptions import ProcessNotFoundError, ProcessStartError, ProcessStopError
+from ..lib import linux_process
 from ..models.system_configuration import SystemConfiguration
 from .health_checker import HealthChecker, HealthMetrics, ProcessInfo, ProcessState
 from .output_capture import OutputCapture
@@ -17,6 +17,24 @@ from .output_capture import OutputCapture
 # Import specialized services
 from .process_launcher import LaunchResult, ProcessLauncher
 
+# Attributes sampled in one psutil.Process.oneshot() pass
+_RESOURCE_ATTRS = ["cpu_percent", "memory_info", "open_files"]
+_PERFORMANCE_ATTRS = _RESOURCE_ATTRS + ["num_threads"]
+if os.name == "nt":
+    _PERFORMANCE_ATTRS.append("num_handles")
+
+# Per-pid sampling state kept at most for this many pids; the least recently
+# sampled one is dropped first, so ad hoc queries cannot grow it forever
+_SAMPLE_CACHE_SIZE = 64
+
+
+def _remember(cache: Dict[int, Any], pid: int, value: Any) -> None:
+    """Store per-pid sampling state as the most recently used entry."""
+    cache.pop(pid, None)
+    cache[pid] = value
+    if len(cache) > _SAMPLE_CACHE_SIZE:
+        del cache[next(iter(cache))]
+
 
 @dataclass
 class CrashEvent:
@@ -48,7 +66,7 @@ class ProcessMonitor:
 
         # Initialize specialized services
         self.launcher = ProcessLauncher(config)
-        self.output_capture = OutputCapture(config)
+        self.output_capture = OutputCapture(config, on_output=self._notify_output)
         self.health_checker = HealthChecker(config)
         self.crash_callbacks: List[Callable[[str], None]] = []
 
@@ -69,6 +87,12 @@ class ProcessMonitor:
         self._recovered_processes: List[str] = []
         self._output_callback: Optional[Callable[[], None]] = None
 
+        # psutil handles reused across samples (keeps cpu_percent deltas
+        # valid); both caches are bounded by _SAMPLE_CACHE_SIZE
+        self._psutil_processes: Dict[int, psutil.Process] = {}
+        # Linux: previous (cpu seconds, monotonic time) per pid for cpu_percent
+        self._cpu_samples: Dict[int, Tuple[float, float]] = {}
+
     def start_monitoring(
         self,
         command: str,
@@ -206,18 +230,20 @@ class ProcessMonitor:
         Args:
             session_id: Session to clean up
         """
-        # Stop output capture
-        archived_output = self.output_capture.get_all_output(session_id)
+        # Stop output capture; the pipe is drained first, so the archive
+        # keeps the output's tail
+        archived_output = self.output_capture.stop_capture(session_id)
         if archived_output:
             self._archived_output[session_id] = archived_output
-        self.output_capture.stop_capture(session_id)
 
         # Unregister from health checker
         self.health_checker.unregister_process(session_id)
 
         # Remove from tracked sessions
-        if session_id in self.monitored_processes:
-            del self.monitored_processes[session_id]
+        info = self.monitored_processes.pop(session_id, None)
+        if info is not None:
+            self._psutil_processes.pop(info.pid, None)
+            self._cpu_samples.pop(info.pid, None)
 
     def _pick_session_id(self, session_id: Optional[str]) -> Optional[str]:
         """Return a valid session id, prefer provided else first active."""
@@ -228,13 +254,16 @@ class ProcessMonitor:
         return None
 
     def get_recent_output(
-        self, session_id: Optional[str] = None, lines: int = 50
-    ) -> List[str]:
+        self, session_id: Optional[str] = None, lines: int = 50, decode: bool = True
+    ) -> List[Union[str, bytes]]:
         """Get recent output from a monitored process.
 
         Args:
             session_id: Session identifier
             lines: Maximum number of lines to return
+            decode: Decode captured lines; when False, lines still held as
+                raw bytes are returned undecoded (see
+                :meth:`get_output_encoding`)
 
         Returns:
             List of recent output lines
@@ -252,7 +281,25 @@ class ProcessMonitor:
                 return data[-lines:]
             return []
 
-        return self.output_capture.get_recent_output(target_session, lines)
+        return self.output_capture.get_recent_output(target_session, lines, decode)
+
+    def read_recent_output(
+        self, session_id: str, lines: int = 10
+    ) -> Tuple[List[Union[str, bytes]], int]:
+        """Get recent raw output lines and the output position they end at.
+
+        Lines are returned as stored (see :meth:`get_output_encoding`); pass
+        the position to :meth:`clear_output` to discard only what was read.
+        """
+        self._refresh_process_states()
+        return self.output_capture.read_recent_output(session_id, lines)
+
+    def get_output_encoding(self, session_id: Optional[str] = None) -> str:
+        """Get the encoding of a session's undecoded output lines."""
+        target_session = self._pick_session_id(session_id)
+        if not target_session:
+            return "utf-8"
+        return self.output_capture.get_encoding(target_session)
 
     def get_all_output(self, session_id: Optional[str] = None) -> List[str]:
         """Get all captured output for a session.
@@ -274,12 +321,20 @@ class ProcessMonitor:
             return []
         return self.output_capture.get_all_output(target_session)
 
-    def clear_output(self, session_id: Optional[str] = None) -> int:
-        """Clear stored output for a session."""
+    def clear_output(
+        self, session_id: Optional[str] = None, until: Optional[int] = None
+    ) -> int:
+        """Clear stored output for a session.
+
+        Args:
+            session_id: Session identifier, or the first active session
+            until: Output position from :meth:`read_recent_output`; only
+                lines captured before it are cleared
+        """
         target_session = self._pick_session_id(session_id)
         if not target_session:
             return 0
-        cleared = self.output_capture.clear_output(target_session)
+        cleared = self.output_capture.clear_output(target_session, until)
         if target_session in self._archived_output:
             self._archived_output[target_session] = []
         return cleared
@@ -319,6 +374,24 @@ class ProcessMonitor:
         target_session = self._pick_session_id(session_id)
         if not target_session:
             return None
+
+        info = self.monitored_processes.get(target_session)
+        if linux_process.AVAILABLE and info is not None:
+            sample = self._read_proc_sample(info.pid)
+            if sample is not None:
+                stat, cpu_percent, open_files = sample
+                return {
+                    "cpu_percent": cpu_percent,
+                    "memory_usage": stat.memory_percent,
+                    "memory_mb": stat.rss_bytes / 1024 / 1024,
+                    "status": stat.status,
+                    "open_files": open_files,
+                    "thread_count": stat.num_threads,
+                    "uptime_seconds": (
+                        datetime.now() - info.start_time
+                    ).total_seconds(),
+                }
+
         metrics = self.health_checker.get_health_metrics(target_session)
         if not metrics:
             return None
@@ -379,22 +452,24 @@ class ProcessMonitor:
     def get_resource_usage(self, pid: int) -> Optional[Dict[str, Any]]:
         """Return resource usage metrics for a given PID."""
         self._refresh_process_states()
-        try:
-            process = psutil.Process(pid)
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            return None
-
-        try:
-            cpu_percent = process.cpu_percent(interval=0.0)
-            memory_mb = process.memory_info().rss / 1024 / 1024
-            open_files = len(process.open_files())
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
+        if linux_process.AVAILABLE:
+            sample = self._read_proc_sample(pid)
+            if sample is not None:
+                stat, cpu_percent, open_files = sample
+                return {
+                    "cpu_percent": cpu_percent,
+                    "memory_mb": stat.rss_bytes / 1024 / 1024,
+                    "open_files": open_files,
+                }
+
+        sample = self._sample_process(pid, _RESOURCE_ATTRS)
+        if sample is None or any(sample[attr] is None for attr in _RESOURCE_ATTRS):
             return None
 
         return {
-            "cpu_percent": cpu_percent,
-            "memory_mb": memory_mb,
-            "open_files": open_files,
+            "cpu_percent": sample["cpu_percent"],
+            "memory_mb": sample["memory_info"].rss / 1024 / 1024,
+            "open_files": len(sample["open_files"]),
         }
 
     def get_crash_events(self) -> List[CrashEvent]:
@@ -424,11 +499,7 @@ class ProcessMonitor:
         if not target_session:
             return
         self.output_capture.inject_output(text, target_session)
-        if self._output_callback:
-            try:
-                self._output_callback()
-            except Exception:
-                pass
+        self._notify_output(target_session)
 
     def simulate_process_death(self, session_id: Optional[str] = None) -> None:
         """Simulate abrupt process termination for testing.
@@ -474,9 +545,13 @@ class ProcessMonitor:
         """Register a callback triggered when new output arrives."""
         self._output_callback = callback
 
-    def register_output_callback(self, callback: Optional[Callable[[], None]]) -> None:
-        """Register a callback triggered when new output arrives."""
-        self._output_callback = callback
+    def _notify_output(self, session_id: str) -> None:
+        """Run the output callback as soon as a session produces output."""
+        if self._output_callback:
+            try:
+                self._output_callback()
+            except Exception:
+                pass
 
     def get_monitoring_overhead(self) -> Dict[str, float]:
         """Get monitoring system overhead metrics.
@@ -550,16 +625,22 @@ class ProcessMonitor:
             return False
 
         try:
-            if session_id in self.launcher._process_handles:
-                process = self.launcher._process_handles[session_id]
-                if process and process.poll() is None:
-                    process.terminate()
-                    try:
-                        process.wait(timeout=timeout)
-                    except subprocess.TimeoutExpired:
-                        process.kill()
-            else:
-                psutil.Process(pid).terminate()
+            # The launcher terminates its own child and blocks in wait(), which
+            # returns as soon as the child is reaped
+            self.launcher.stop_process(session_id, force=False, timeout=timeout)
+        except ProcessNotFoundError:
+            try:
+                process = psutil.Process(pid)
+                process.terminate()
+                try:
+                    process.wait(timeout=timeout)
+                except psutil.TimeoutExpired:
+                    process.kill()
+                    process.wait(timeout=1)
+            except psutil.NoSuchProcess:
+                pass
+            except Exception:
+                return False
         except Exception:
             return False
 
@@ -577,23 +658,27 @@ class ProcessMonitor:
         return {"pid": pid, "children": children}
 
     def get_performance_counters(self, pid: int) -> Dict[str, Any]:
-        try:
-            process = psutil.Process(pid)
-            return {
-                "cpu_percent": process.cpu_percent(interval=0.0),
-                "memory_mb": process.memory_info().rss / 1024 / 1024,
-                "thread_count": process.num_threads(),
-                "open_files": len(process.open_files()),
-                "handle_count": getattr(process, "num_handles", lambda: 0)(),
-            }
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            return {
-                "cpu_percent": 0.0,
-                "memory_mb": 0.0,
-                "thread_count": 0,
-                "open_files": 0,
-                "handle_count": 0,
-            }
+        if linux_process.AVAILABLE:
+            proc_sample = self._read_proc_sample(pid)
+            if proc_sample is not None:
+                stat, cpu_percent, open_files = proc_sample
+                return {
+                    "cpu_percent": cpu_percent,
+                    "memory_mb": stat.rss_bytes / 1024 / 1024,
+                    "thread_count": stat.num_threads,
+                    "open_files": open_files,
+                    "handle_count": 0,  # Windows only
+                }
+
+        sample = self._sample_process(pid, _PERFORMANCE_ATTRS) or {}
+        memory_info = sample.get("memory_info")
+        return {
+            "cpu_percent": sample.get("cpu_percent") or 0.0,
+            "memory_mb": memory_info.rss / 1024 / 1024 if memory_info else 0.0,
+            "thread_count": sample.get("num_threads") or 0,
+            "open_files": len(sample.get("open_files") or []),
+            "handle_count": sample.get("num_handles") or 0,
+        }
 
     # --------------------------------------------------------------------- #
     # Internal helpers
@@ -618,6 +703,46 @@ class ProcessMonitor:
         )
         self._recorded_crash_sessions.add(event_key)
 
+    def _read_proc_sample(
+        self, pid: int
+    ) -> Optional[Tuple[linux_process.ProcStat, float, int]]:
+        """Sample a process from /proc/<pid>/stat and /proc/<pid>/fd (Linux).
+
+        Returns ``(stat, cpu_percent, open regular file count)``, or None when
+        /proc cannot be read so the caller can fall back to psutil.
+        """
+        try:
+            stat = linux_process.read_stat(pid)
+            open_files = linux_process.count_open_files(pid)
+        except (OSError, ValueError, IndexError):
+            self._cpu_samples.pop(pid, None)
+            return None
+
+        now = time.monotonic()
+        previous = self._cpu_samples.get(pid)
+        _remember(self._cpu_samples, pid, (stat.cpu_seconds, now))
+        cpu_percent = 0.0
+        if previous is not None and now > previous[1]:
+            cpu_percent = 100.0 * (stat.cpu_seconds - previous[0]) / (now - previous[1])
+
+        return stat, cpu_percent, open_files
+
+    def _sample_process(self, pid: int, attrs: List[str]) -> Optional[Dict[str, Any]]:
+        """Read several process attributes in a single psutil pass.
+
+        Attributes that are access-denied come back as None. Returns None if
+        the process no longer exists.
+        """
+        try:
+            process = self._psutil_processes.get(pid) or psutil.Process(pid)
+            _remember(self._psutil_processes, pid, process)
+            return process.as_dict(attrs=attrs, ad_value=None)
+        except psutil.NoSuchProcess:
+            self._psutil_processes.pop(pid, None)
+            return None
+        except psutil.AccessDenied:
+            return None
+
     def _refresh_process_states(self) -> None:
         """Refresh process information and capture crashes."""
         for session_id in list(self.monitored_processes.keys()):
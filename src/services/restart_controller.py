@@ -24,7 +24,7 @@ from .pattern_detector import PatternDetector
 from .process_monitor import ProcessMonitor
 from .state_manager import StateManager
 from .task_queue import TaskQueueManager
-from .timing_manager import TimingManager
+from .timing_manager import Clock, TimingManager
 
 
 class ControllerState(Enum):
@@ -56,15 +56,20 @@ class SystemStatus:
 class RestartController:
     """Main orchestration service for Claude Code restart system."""
 
-    def __init__(self, config: SystemConfiguration):
-        """Initialize the restart controller."""
+    def __init__(self, config: SystemConfiguration, clock: Optional[Clock] = None):
+        """Initialize the restart controller.
+
+        Args:
+            config: System configuration
+            clock: Time source for waiting periods (system clock if None)
+        """
         self.config = config
         self.state = ControllerState.INACTIVE
 
         # Initialize services
         self.process_monitor = ProcessMonitor(config)
         self.pattern_detector = PatternDetector(config)
-        self.timing_manager = TimingManager(config)
+        self.timing_manager = TimingManager(config, clock=clock)
         self.state_manager = StateManager(config)
         self.state_manager.on_state_loaded = self._apply_state_data
         self.config_manager = ConfigManager()
@@ -87,6 +92,8 @@ class RestartController:
         self.controller_thread: Optional[threading.Thread] = None
         self.running = False
         self._shutdown_event = threading.Event()
+        # Set by capture threads when output arrives; wakes the loop early
+        self._output_event = threading.Event()
 
         # Statistics
         self.start_time = datetime.now()
@@ -321,6 +328,7 @@ class RestartController:
         """Stop the main controller thread."""
         self.running = False
         self._shutdown_event.set()
+        self._output_event.set()
 
         if self.controller_thread and self.controller_thread.is_alive():
             self.controller_thread.join(timeout=5)
@@ -344,9 +352,10 @@ class RestartController:
                 if self.state_manager.should_auto_save():
                     self._save_current_state()
 
-                # Sleep until next check
+                # Sleep until next check, or until new output is captured
                 check_interval = self.config.monitoring.get("check_interval", 1.0)
-                self._shutdown_event.wait(check_interval)
+                self._output_event.wait(check_interval)
+                self._output_event.clear()
 
             except Exception as e:
                 self.error_count += 1
@@ -361,22 +370,35 @@ class RestartController:
             if not session.is_active() and session.status != SessionStatus.WAITING:
                 continue
 
-            # Get recent output from process monitor
-            recent_output = self.process_monitor.get_recent_output(session_id, lines=10)
+            # Get recent output from process monitor; the detector decodes
+            # each raw line with the session's pipe encoding
+            recent_output, position = self.process_monitor.read_recent_output(
+                session_id, lines=10
+            )
+            encoding = self.process_monitor.get_output_encoding(session_id)
 
             for line in recent_output:
                 # Check for limit detection
-                detection_event = self.pattern_detector.detect_limit_message(line)
+                detection_event = self.pattern_detector.detect_limit_message(
+                    line, encoding
+                )
 
                 if detection_event:
                     detection_event.session_id = session_id
-                    self._handle_limit_detection(session, detection_event)
+                    self._handle_limit_detection(session, detection_event, position)
                     break  # Only process one detection per check
 
     def _handle_limit_detection(
-        self, session: MonitoringSession, event: LimitDetectionEvent
+        self,
+        session: MonitoringSession,
+        event: LimitDetectionEvent,
+        output_position: Optional[int] = None,
     ) -> None:
-        """Handle a detected usage limit."""
+        """Handle a detected usage limit.
+
+        ``output_position`` is where the scanned output ended; only lines
+        before it are cleared, so output captured meanwhile is still checked.
+        """
         with self._lock:
             if session.status == SessionStatus.WAITING:
                 session.detection_count += 1
@@ -384,7 +406,7 @@ class RestartController:
                 self._last_waiting_period = self.waiting_periods.get(
                     session.waiting_period_id, self._last_waiting_period
                 )
-                self.process_monitor.clear_output(session.session_id)
+                self.process_monitor.clear_output(session.session_id, output_position)
                 return
 
             # Check if task is in progress
@@ -423,7 +445,7 @@ class RestartController:
 
             # Save state
             self._save_current_state()
-            self.process_monitor.clear_output(session.session_id)
+            self.process_monitor.clear_output(session.session_id, output_position)
 
             # Trigger event
             self._trigger_event(
@@ -744,39 +766,42 @@ class RestartController:
                     print(f"Error in event callback for {event_type}: {e}")
 
     def _on_process_output(self) -> None:
-        """Triggered when process monitor reports new output."""
-        try:
-            self._check_for_limit_detections()
-        except Exception as exc:
-            self._trigger_event(
-                "error_occurred", {"error": str(exc), "context": "process_output"}
-            )
+        """Triggered when process monitor reports new output.
+
+        Runs on capture threads, so it only wakes the controller loop;
+        detection itself stays on the controller thread.
+        """
+        self._output_event.set()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the persistable system state as a plain dictionary.
+
+        The result is what ``StateManager.save_state`` writes and what
+        ``restore_state`` accepts.
+        """
+        return {
+            "sessions": {
+                sid: session.to_dict() for sid, session in self.active_sessions.items()
+            },
+            "waiting_periods": {
+                pid: period.to_dict() for pid, period in self.waiting_periods.items()
+            },
+            "detection_events": [
+                event.to_dict() for event in self.detection_events[-100:]
+            ],  # Keep last 100
+            "statistics": {
+                "start_time": self.start_time.isoformat(),
+                "restart_count": self.restart_count,
+                "error_count": self.error_count,
+                "state": self.state.value,
+            },
+            "task_queue": self.task_queue.to_serializable(),
+        }
 
     def _save_current_state(self) -> None:
         """Save current system state."""
         try:
-            state_data = {
-                "sessions": {
-                    sid: session.to_dict()
-                    for sid, session in self.active_sessions.items()
-                },
-                "waiting_periods": {
-                    pid: period.to_dict()
-                    for pid, period in self.waiting_periods.items()
-                },
-                "detection_events": [
-                    event.to_dict() for event in self.detection_events[-100:]
-                ],  # Keep last 100
-                "statistics": {
-                    "start_time": self.start_time.isoformat(),
-                    "restart_count": self.restart_count,
-                    "error_count": self.error_count,
-                    "state": self.state.value,
-                },
-                "task_queue": self.task_queue.to_serializable(),
-            }
-
-            self.state_manager.save_state(state_data)
+            self.state_manager.save_state(self.snapshot())
         except Exception as e:
             print(f"Error saving state: {e}")
 
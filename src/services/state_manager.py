@@ -17,6 +17,8 @@ from ..models.limit_detection_event import LimitDetectionEvent
 from ..models.monitoring_session import MonitoringSession
 from ..models.system_configuration import SystemConfiguration
 from ..models.waiting_period import WaitingPeriod
+from ..utils.files import atomic_write_bytes
+from ..utils.serialization import dumps, loads
 
 
 class StateManager:
@@ -120,16 +122,7 @@ class StateManager:
                 if self.backup_on_save and os.path.exists(self.state_file):
                     self._create_backup()
 
-                # Write to temporary file first (atomic operation)
-                temp_file = self.state_file + ".tmp"
-                with open(temp_file, "w", encoding="utf-8") as f:
-                    json.dump(save_data, f, indent=2, ensure_ascii=False)
-
-                # Atomic move
-                if os.name == "nt":  # Windows
-                    if os.path.exists(self.state_file):
-                        os.remove(self.state_file)
-                os.rename(temp_file, self.state_file)
+                atomic_write_bytes(self.state_file, dumps(save_data, indent=True))
 
                 # Update cache and timestamps
                 self._cached_state = data_to_save
@@ -140,13 +133,6 @@ class StateManager:
 
             except Exception as e:
                 print(f"Error saving state: {e}")
-                # Cleanup temp file if it exists
-                temp_file = self.state_file + ".tmp"
-                if os.path.exists(temp_file):
-                    try:
-                        os.remove(temp_file)
-                    except Exception:
-                        pass
                 if isinstance(e, PermissionError):
                     raise
                 return False
@@ -163,8 +149,8 @@ class StateManager:
                 if not os.path.exists(self.state_file):
                     return None
 
-                with open(self.state_file, "r", encoding="utf-8") as f:
-                    loaded_data = json.load(f)
+                with open(self.state_file, "rb") as f:
+                    loaded_data = loads(f.read())
 
                 # Validate structure
                 if not isinstance(loaded_data, dict) or "state" not in loaded_data:
@@ -289,8 +275,8 @@ class StateManager:
 
             # Try loading from most recent backup
             most_recent_backup = backup_files[0][0]
-            with open(most_recent_backup, "r", encoding="utf-8") as f:
-                loaded_data = json.load(f)
+            with open(most_recent_backup, "rb") as f:
+                loaded_data = loads(f.read())
 
             if "state" in loaded_data:
                 print(f"State loaded from backup: {most_recent_backup}")
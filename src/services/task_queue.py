@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+from collections import deque
 from datetime import datetime
-from typing import Iterable, List, Optional
+from typing import Deque, Iterable, List, Optional
 
 from ..models.queued_task import QueuedTask
 
@@ -12,7 +13,7 @@ class TaskQueueManager:
     """In-memory manager for queued tasks."""
 
     def __init__(self, tasks: Optional[Iterable[QueuedTask]] = None):
-        self._tasks: List[QueuedTask] = list(tasks) if tasks is not None else []
+        self._tasks: Deque[QueuedTask] = deque(tasks if tasks is not None else ())
 
     def __len__(self) -> int:
         return len(self._tasks)
@@ -49,19 +50,17 @@ class TaskQueueManager:
 
     def remove_indices(self, indices: Iterable[int]) -> List[QueuedTask]:
         """Remove tasks by 1-based indices, returning removed tasks."""
-        unique_indices = sorted(
-            {idx for idx in indices if isinstance(idx, int)}, reverse=True
-        )
-        removed_with_index = []
-
-        for idx in unique_indices:
-            if 1 <= idx <= len(self._tasks):
-                removed_task = self._tasks.pop(idx - 1)
-                removed_with_index.append((idx, removed_task))
-
-        # Return removed tasks in ascending index order
-        removed_with_index.sort(key=lambda item: item[0])
-        return [task for _, task in removed_with_index]
+        wanted = {idx for idx in indices if isinstance(idx, int)}
+        if not wanted:
+            return []
+
+        # Rebuild the queue in one pass; removed tasks come out in index order
+        kept: Deque[QueuedTask] = deque()
+        removed: List[QueuedTask] = []
+        for position, task in enumerate(self._tasks, start=1):
+            (removed if position in wanted else kept).append(task)
+        self._tasks = kept
+        return removed
 
     def clear(self) -> int:
         """Clear the queue, returning number of removed tasks."""
@@ -77,9 +76,7 @@ class TaskQueueManager:
 
     def prepend(self, tasks: Iterable[QueuedTask]) -> None:
         """Prepend tasks back to the queue preserving existing order."""
-        tasks_list = list(tasks)
-        if tasks_list:
-            self._tasks = tasks_list + self._tasks
+        self._tasks.extendleft(reversed(list(tasks)))
 
     def to_serializable(self) -> List[dict]:
         """Serialize tasks for persistence."""
@@ -87,7 +84,7 @@ class TaskQueueManager:
 
     def load_serialized(self, data: Iterable[dict]) -> None:
         """Load tasks from serialized representation."""
-        self._tasks = [QueuedTask.from_dict(item) for item in data]
+        self._tasks = deque(QueuedTask.from_dict(item) for item in data)
 
     def next_scheduled_time(self) -> Optional[datetime]:
         """Return earliest creation timestamp, if any."""
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Dict, List, Optional
 
 
@@ -18,6 +19,11 @@ class TaskTemplate:
 
     def build_guideline_prompt(self) -> str:
         """Render guidelines into a single prompt string."""
+        return self.guideline_prompt
+
+    @cached_property
+    def guideline_prompt(self) -> str:
+        """Guidelines rendered once; templates do not change after creation."""
         lines: List[str] = []
         if self.quality_guidelines:
             lines.append("### 품질 체크리스트")
@@ -111,3 +117,7 @@ class TemplateManager:
     def get(self, template_id: str) -> Optional[TaskTemplate]:
         """Return a template by id."""
         return self._templates.get(template_id)
+
+
+# Shared manager for the built-in templates
+TEMPLATE_MANAGER = TemplateManager()
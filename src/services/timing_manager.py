@@ -9,12 +9,28 @@ import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Protocol
 
 from ..models.system_configuration import SystemConfiguration
 from ..models.waiting_period import PeriodStatus, WaitingPeriod
 
 
+class Clock(Protocol):
+    """Source of the current wall-clock time."""
+
+    def now(self) -> datetime:
+        """Return the current local time."""
+        ...
+
+
+class SystemClock:
+    """Clock backed by the system time."""
+
+    def now(self) -> datetime:
+        """Return the current local time."""
+        return datetime.now()
+
+
 @dataclass
 class ClockDriftEvent:
     """Information about detected clock drift."""
@@ -29,9 +45,19 @@ class ClockDriftEvent:
 class TimingManager:
     """Service for managing precise timing and countdown periods."""
 
-    def __init__(self, config: Optional[SystemConfiguration] = None):
-        """Initialize the timing manager."""
+    def __init__(
+        self,
+        config: Optional[SystemConfiguration] = None,
+        clock: Optional[Clock] = None,
+    ):
+        """Initialize the timing manager.
+
+        Args:
+            config: System configuration (defaults are used if None)
+            clock: Time source for period and drift checks (system clock if None)
+        """
         self.config = config or SystemConfiguration.create_default()
+        self.clock: Clock = clock or SystemClock()
         self.active_periods: Dict[str, WaitingPeriod] = {}
         self.completed_periods: List[WaitingPeriod] = []
         self.clock_drift_events: List[ClockDriftEvent] = []
@@ -52,7 +78,7 @@ class TimingManager:
         self._lock = threading.RLock()
 
         # Clock drift detection
-        self.last_clock_check = datetime.now()
+        self.last_clock_check = self.clock.now()
         self.system_boot_time = self._get_system_boot_time()
 
         # Callbacks
@@ -195,7 +221,7 @@ class TimingManager:
         completed_ids = []
 
         with self._lock:
-            current_time = datetime.now()
+            current_time = self.clock.now()
             for period_id, period in list(self.active_periods.items()):
                 if (
                     period.is_active()
@@ -232,7 +258,7 @@ class TimingManager:
                 if (
                     period.is_active()
                     and period.end_time is not None
-                    and datetime.now() >= period.end_time
+                    and self.clock.now() >= period.end_time
                 ):
                     period.complete()
                     completed_ids = [period_id]
@@ -312,7 +338,7 @@ class TimingManager:
         Returns:
             ClockDriftEvent if significant drift detected
         """
-        current_time = datetime.now()
+        current_time = self.clock.now()
 
         actual_elapsed = (current_time - self.last_clock_check).total_seconds()
         expected_elapsed = self.check_frequency
@@ -355,7 +381,7 @@ class TimingManager:
     def get_system_uptime(self) -> timedelta:
         """Get system uptime since boot."""
         if self.system_boot_time:
-            return datetime.now() - self.system_boot_time
+            return self.clock.now() - self.system_boot_time
         return timedelta(0)
 
     def _get_system_boot_time(self) -> Optional[datetime]:
@@ -414,7 +440,7 @@ class TimingManager:
 
         for trigger_seconds in triggers:
             notification_time = period.end_time - timedelta(seconds=trigger_seconds)
-            if notification_time > datetime.now():
+            if notification_time > self.clock.now():
                 notifications.append(notification_time)
 
         return sorted(notifications)
@@ -0,0 +1,46 @@
+"""File helpers for Claude Code Restart Monitor.
+
+Provides crash-safe replacement of JSON state and configuration files.
+"""
+
+import os
+from typing import Optional
+
+
+def _running_tests() -> bool:
+    """Check whether the process runs under the test suite."""
+    test_mode = os.getenv("CLAUDE_RESTART_TEST_MODE")
+    return bool((test_mode and test_mode != "0") or os.getenv("PYTEST_CURRENT_TEST"))
+
+
+def atomic_write_bytes(
+    file_path: str, data: bytes, durable: Optional[bool] = None
+) -> None:
+    """Replace a file's contents without ever exposing a partial write.
+
+    The data is written to ``<file_path>.tmp`` and renamed over the target
+    with ``os.replace``, so readers see either the old or the new contents.
+
+    Args:
+        file_path: File to write
+        data: New contents
+        durable: Flush the data to disk before the rename. Defaults to True
+            outside the test suite; the rename alone is enough for tests.
+    """
+    if durable is None:
+        durable = not _running_tests()
+
+    temp_file = file_path + ".tmp"
+    try:
+        with open(temp_file, "wb") as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_file, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_file)
+        except OSError:
+            pass
+        raise
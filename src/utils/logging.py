@@ -3,12 +3,13 @@
 Provides context-aware logging with structured data for better observability.
 """
 
-import json
 import logging
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from .serialization import dumps
+
 
 class StructuredLogger:
     """Structured logger with context support."""
@@ -105,10 +106,14 @@ class StructuredLogger:
         if kwargs:
             log_data.update(kwargs)
 
-        serialized = json.dumps(log_data, default=str)
+        serialized = dumps(log_data, default=str).decode("utf-8")
 
         self._ensure_capture_handler_format()
-        self.logger.log(level, serialized, extra={"structured_json": serialized})
+        self.logger.log(
+            level,
+            serialized,
+            extra={"structured_json": serialized, "structured_data": log_data},
+        )
 
     @staticmethod
     def _ensure_capture_handler_format() -> None:
@@ -167,7 +172,7 @@ class StructuredFormatter(logging.Formatter):
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
 
-        return json.dumps(log_data, default=str)
+        return dumps(log_data, default=str).decode("utf-8")
 
 
 class ContextLogger:
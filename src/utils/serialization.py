@@ -0,0 +1,67 @@
+"""JSON encoding helpers for Claude Code Restart Monitor.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Both paths write the same documents, with two exceptions:
+orjson writes NaN and infinities as ``null`` where ``json`` writes the
+non-standard ``NaN``/``Infinity``, and it reads integers wider than 64
+bits as floats. Callers that need either must use ``json`` directly.
+"""
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:  # Optional fast JSON codec (pip install ".[performance]")
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document.
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # json also accepts NaN/Infinity and raises the same error type
+            pass
+    return json.loads(data)
+
+
+def dumps(
+    obj: Any, indent: bool = False, default: Optional[Callable[[Any], Any]] = None
+) -> bytes:
+    """Encode an object as UTF-8 JSON.
+
+    Args:
+        obj: JSON-compatible object
+        indent: Pretty-print with two-space indentation
+        default: Called for objects JSON cannot represent; with orjson it
+            also receives datetimes and dataclasses, as with ``json``
+
+    Raises:
+        TypeError: If an object cannot be encoded and no default handles it
+    """
+    if orjson is not None:
+        option = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            # Integers wider than 64 bits; json handles them (or raises)
+            pass
+    if indent:
+        text = json.dumps(obj, indent=2, ensure_ascii=False, default=default)
+    else:
+        text = json.dumps(
+            obj, separators=(",", ":"), ensure_ascii=False, default=default
+        )
+    return text.encode("utf-8")
@@ -4,10 +4,51 @@ from __future__ import annotations
 
 import os
 import sys
+from collections import Counter
+from datetime import datetime, timedelta
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 os.environ.setdefault("CLAUDE_RESTART_TEST_MODE", "1")
+
+
+class FakeClock:
+    """Clock running at real speed that tests can move forward or back.
+
+    Waiting periods still take their start and end times from the real
+    clock, so the fake clock follows it and only adds the offset applied
+    through :meth:`advance`.
+    """
+
+    def __init__(self):
+        self.offset = timedelta(0)
+
+    def now(self) -> datetime:
+        return datetime.now() + self.offset
+
+    def advance(self, delta: timedelta) -> None:
+        self.offset += delta
+
+
+@pytest.fixture
+def fake_clock():
+    """Provide a clock the test can shift with ``advance``."""
+    return FakeClock()
+
+
+def pytest_collection_modifyitems(config, items):
+    """Fail collection if any test would run more than once."""
+    duplicates = [
+        nodeid
+        for nodeid, count in Counter(item.nodeid for item in items).items()
+        if count > 1
+    ]
+    if duplicates:
+        raise pytest.UsageError(
+            "Tests collected more than once: " + ", ".join(sorted(duplicates))
+        )
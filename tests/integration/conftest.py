@@ -0,0 +1,62 @@
+"""Shared fixtures for integration tests."""
+
+import shlex
+import shutil
+
+import pytest
+
+from src.models.system_configuration import SystemConfiguration
+from src.services.process_launcher import ProcessLauncher
+from src.services.restart_controller import RestartController
+
+RESTART_TEST_CONFIG = {
+    "log_level": "DEBUG",
+    "detection_patterns": ["test limit message"],
+    "max_log_size_mb": 10,
+    "monitoring": {
+        "check_interval": 0.1,  # Fast for testing
+        "task_timeout": 5,
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def config_factory(tmp_path_factory):
+    """Return a factory producing fresh restart-cycle test configurations.
+
+    State and log files live in a directory private to the module (and to
+    the xdist worker running it), so parallel runs never share them.
+    """
+    data_dir = tmp_path_factory.mktemp("restart-cycle")
+    return lambda: SystemConfiguration(
+        **RESTART_TEST_CONFIG,
+        persistence_file=str(data_dir / "state.json"),
+        log_file_path=str(data_dir / "claude-restart-monitor.log"),
+    )
+
+
+@pytest.fixture
+def simulated_processes(monkeypatch):
+    """Launch commands as simulated processes instead of forking them.
+
+    Commands that exist on PATH get a simulated session from the launcher;
+    unknown executables still go through the real launch path, so start-up
+    errors surface exactly as they would in production.
+    """
+    launch_process = ProcessLauncher.launch_process
+
+    def launch(self, command, session_id, work_dir=None, env_vars=None):
+        args = shlex.split(command) if isinstance(command, str) else list(command)
+        if not args or shutil.which(args[0]) is None:
+            return launch_process(self, command, session_id, work_dir, env_vars)
+        return self._create_simulated_process(session_id, command)
+
+    monkeypatch.setattr(ProcessLauncher, "launch_process", launch)
+
+
+@pytest.fixture
+def controller(config_factory, simulated_processes, fake_clock):
+    """Provide a RestartController that is stopped after the test."""
+    restart_controller = RestartController(config_factory(), clock=fake_clock)
+    yield restart_controller
+    restart_controller.stop_monitoring()
@@ -8,7 +8,6 @@ This test MUST FAIL initially before implementation.
 
 import json
 import os
-import tempfile
 from pathlib import Path
 
 import pytest
@@ -17,17 +16,6 @@ import pytest
 class TestConfigurationValidation:
     """Integration test for configuration validation scenarios."""
 
-    def setup_method(self):
-        """Set up test environment."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.config_file = os.path.join(self.temp_dir, "test_config.json")
-
-    def teardown_method(self):
-        """Clean up test environment."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir)
-
     @pytest.mark.integration
     def test_default_configuration_loading(self):
         """Test that default configuration loads successfully."""
@@ -44,10 +32,12 @@ class TestConfigurationValidation:
         assert config.backup_count >= 0
 
     @pytest.mark.integration
-    def test_custom_configuration_file_loading(self):
+    def test_custom_configuration_file_loading(self, tmp_path):
         """Test loading configuration from custom file."""
         from src.services.config_manager import ConfigManager
 
+        config_file = str(tmp_path / "test_config.json")
+
         # Create test config file
         test_config = {
             "log_level": "DEBUG",
@@ -57,11 +47,11 @@ class TestConfigurationValidation:
             "monitoring": {"check_interval": 2, "task_timeout": 600},
         }
 
-        with open(self.config_file, "w") as f:
+        with open(config_file, "w") as f:
             json.dump(test_config, f)
 
         config_manager = ConfigManager()
-        config = config_manager.load_config(self.config_file)
+        config = config_manager.load_config(config_file)
 
         assert config.log_level == "DEBUG"
         assert "custom pattern 1" in config.detection_patterns
@@ -69,10 +59,12 @@ class TestConfigurationValidation:
         assert config.backup_count == 5
 
     @pytest.mark.integration
-    def test_configuration_validation_valid_values(self):
+    def test_configuration_validation_valid_values(self, tmp_path):
         """Test configuration validation with valid values."""
         from src.services.config_manager import ConfigManager
 
+        config_file = str(tmp_path / "test_config.json")
+
         valid_configs = [
             {
                 "log_level": "INFO",
@@ -91,20 +83,22 @@ class TestConfigurationValidation:
         config_manager = ConfigManager()
 
         for test_config in valid_configs:
-            with open(self.config_file, "w") as f:
+            with open(config_file, "w") as f:
                 json.dump(test_config, f)
 
             # Should not raise exception
-            config = config_manager.load_config(self.config_file)
+            config = config_manager.load_config(config_file)
             validation_result = config_manager.validate_config(config)
             assert validation_result.is_valid
             assert len(validation_result.errors) == 0
 
     @pytest.mark.integration
-    def test_configuration_validation_invalid_values(self):
+    def test_configuration_validation_invalid_values(self, tmp_path):
         """Test configuration validation with invalid values."""
         from src.services.config_manager import ConfigManager
 
+        config_file = str(tmp_path / "test_config.json")
+
         invalid_configs = [
             {
                 "log_level": "INVALID_LEVEL",
@@ -123,18 +117,20 @@ class TestConfigurationValidation:
         config_manager = ConfigManager()
 
         for test_config in invalid_configs:
-            with open(self.config_file, "w") as f:
+            with open(config_file, "w") as f:
                 json.dump(test_config, f)
 
             with pytest.raises(Exception):
-                config_manager.load_config(self.config_file)
+                config_manager.load_config(config_file)
 
     @pytest.mark.integration
-    def test_configuration_hot_reload(self):
+    def test_configuration_hot_reload(self, tmp_path):
         """Test hot reloading of configuration during runtime."""
         from src.services.config_manager import ConfigManager
         from src.services.restart_controller import RestartController
 
+        config_file = str(tmp_path / "test_config.json")
+
         # Initial config
         initial_config = {
             "log_level": "INFO",
@@ -142,11 +138,11 @@ class TestConfigurationValidation:
             "max_log_size_mb": 25,
         }
 
-        with open(self.config_file, "w") as f:
+        with open(config_file, "w") as f:
             json.dump(initial_config, f)
 
         config_manager = ConfigManager()
-        controller = RestartController(config_manager.load_config(self.config_file))
+        controller = RestartController(config_manager.load_config(config_file))
 
         # Verify initial config
         assert controller.config.log_level == "INFO"
@@ -159,11 +155,11 @@ class TestConfigurationValidation:
             "max_log_size_mb": 50,
         }
 
-        with open(self.config_file, "w") as f:
+        with open(config_file, "w") as f:
             json.dump(updated_config, f)
 
         # Reload config
-        controller.reload_config(self.config_file)
+        controller.reload_config(config_file)
 
         # Verify updated config
         assert controller.config.log_level == "DEBUG"
@@ -172,10 +168,12 @@ class TestConfigurationValidation:
         assert controller.config.max_log_size_mb == 50
 
     @pytest.mark.integration
-    def test_configuration_backup_and_restore(self):
+    def test_configuration_backup_and_restore(self, tmp_path):
         """Test configuration backup and restore functionality."""
         from src.services.config_manager import ConfigManager
 
+        config_file = str(tmp_path / "test_config.json")
+
         original_config = {
             "log_level": "INFO",
             "detection_patterns": ["original pattern"],
@@ -183,13 +181,13 @@ class TestConfigurationValidation:
             "backup_count": 3,
         }
 
-        with open(self.config_file, "w") as f:
+        with open(config_file, "w") as f:
             json.dump(original_config, f)
 
         config_manager = ConfigManager()
 
         # Create backup
-        backup_path = config_manager.create_backup(self.config_file)
+        backup_path = config_manager.create_backup(config_file)
         assert os.path.exists(backup_path)
 
         # Modify original
@@ -200,14 +198,14 @@ class TestConfigurationValidation:
             "backup_count": 1,
         }
 
-        with open(self.config_file, "w") as f:
+        with open(config_file, "w") as f:
             json.dump(modified_config, f)
 
         # Restore from backup
-        config_manager.restore_from_backup(backup_path, self.config_file)
+        config_manager.restore_from_backup(backup_path, config_file)
 
         # Verify restoration
-        with open(self.config_file, "r") as f:
+        with open(config_file, "r") as f:
             restored_config = json.load(f)
 
         assert restored_config["log_level"] == "INFO"
@@ -215,10 +213,12 @@ class TestConfigurationValidation:
         assert restored_config["max_log_size_mb"] == 50
 
     @pytest.mark.integration
-    def test_configuration_migration(self):
+    def test_configuration_migration(self, tmp_path):
         """Test configuration migration between versions."""
         from src.services.config_manager import ConfigManager
 
+        config_file = str(tmp_path / "test_config.json")
+
         # Old version config (missing new fields)
         old_config = {
             "log_level": "INFO",
@@ -226,13 +226,13 @@ class TestConfigurationValidation:
             # Missing: max_log_size_mb, backup_count, monitoring section
         }
 
-        with open(self.config_file, "w") as f:
+        with open(config_file, "w") as f:
             json.dump(old_config, f)
 
         config_manager = ConfigManager()
 
         # Should migrate to new format
-        migrated_config = config_manager.migrate_config(self.config_file)
+        migrated_config = config_manager.migrate_config(config_file)
 
         assert migrated_config.log_level == "INFO"
         assert "old pattern" in migrated_config.detection_patterns
@@ -294,20 +294,22 @@ class TestConfigurationValidation:
         assert not config_manager.validate_against_schema(invalid_config)
 
     @pytest.mark.integration
-    def test_configuration_concurrent_access(self):
+    def test_configuration_concurrent_access(self, tmp_path):
         """Test configuration access from multiple threads."""
         import threading
         import time
 
         from src.services.config_manager import ConfigManager
 
+        config_file = str(tmp_path / "test_config.json")
+
         config = {
             "log_level": "INFO",
             "detection_patterns": ["thread test"],
             "max_log_size_mb": 50,
         }
 
-        with open(self.config_file, "w") as f:
+        with open(config_file, "w") as f:
             json.dump(config, f)
 
         config_manager = ConfigManager()
@@ -315,7 +317,7 @@ class TestConfigurationValidation:
 
         def load_config_thread():
             try:
-                loaded_config = config_manager.load_config(self.config_file)
+                loaded_config = config_manager.load_config(config_file)
                 results.append(loaded_config.log_level)
             except Exception as e:
                 results.append(f"Error: {e}")
@@ -8,7 +8,6 @@ This test MUST FAIL initially before implementation.
 
 import os
 import signal
-import tempfile
 import time
 from unittest.mock import Mock, patch
 
@@ -18,16 +17,6 @@ import pytest
 class TestErrorRecoveryScenarios:
     """Integration test for error recovery and resilience."""
 
-    def setup_method(self):
-        """Set up test environment."""
-        self.temp_dir = tempfile.mkdtemp()
-
-    def teardown_method(self):
-        """Clean up test environment."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir)
-
     @pytest.mark.integration
     def test_claude_process_crash_recovery(self):
         """Test recovery when Claude Code process crashes unexpectedly."""
@@ -65,13 +54,15 @@ class TestErrorRecoveryScenarios:
         controller.stop_monitoring()
 
     @pytest.mark.integration
-    def test_file_system_errors_recovery(self):
+    def test_file_system_errors_recovery(self, tmp_path):
         """Test recovery from file system errors (permissions, disk full, etc.)."""
         from src.services.config_manager import ConfigManager
         from src.services.state_manager import StateManager
 
+        temp_dir = str(tmp_path)
+
         # Test permission denied scenario
-        restricted_path = os.path.join(self.temp_dir, "restricted")
+        restricted_path = os.path.join(temp_dir, "restricted")
         os.makedirs(restricted_path)
         os.chmod(restricted_path, 0o000)  # No permissions
 
@@ -90,11 +81,13 @@ class TestErrorRecoveryScenarios:
             os.chmod(restricted_path, 0o755)  # Restore permissions for cleanup
 
     @pytest.mark.integration
-    def test_configuration_corruption_recovery(self):
+    def test_configuration_corruption_recovery(self, tmp_path):
         """Test recovery from corrupted configuration files."""
         from src.services.config_manager import ConfigManager
 
-        config_file = os.path.join(self.temp_dir, "corrupted_config.json")
+        temp_dir = str(tmp_path)
+
+        config_file = os.path.join(temp_dir, "corrupted_config.json")
 
         # Create corrupted JSON file
         with open(config_file, "w") as f:
@@ -111,7 +104,7 @@ class TestErrorRecoveryScenarios:
 
         # Should create backup of corrupted file
         backup_files = [
-            f for f in os.listdir(self.temp_dir) if f.startswith("corrupted_config")
+            f for f in os.listdir(temp_dir) if f.startswith("corrupted_config")
         ]
         assert len(backup_files) >= 2  # Original + backup
 
@@ -197,11 +190,13 @@ class TestErrorRecoveryScenarios:
         assert controller.state_manager.is_state_saved()
 
     @pytest.mark.integration
-    def test_log_rotation_failure_recovery(self):
+    def test_log_rotation_failure_recovery(self, tmp_path):
         """Test recovery when log rotation fails."""
         from src.lib.logging_config import LoggingConfig
 
-        log_file = os.path.join(self.temp_dir, "test.log")
+        temp_dir = str(tmp_path)
+
+        log_file = os.path.join(temp_dir, "test.log")
         logging_config = LoggingConfig(
             log_file=log_file,
             max_size_mb=1,  # Small size to trigger rotation
@@ -213,7 +208,7 @@ class TestErrorRecoveryScenarios:
             f.write("x" * 2 * 1024 * 1024)  # 2MB
 
         # Make log directory read-only to cause rotation failure
-        os.chmod(self.temp_dir, 0o444)
+        os.chmod(temp_dir, 0o444)
 
         try:
             # Should handle rotation failure gracefully
@@ -224,17 +219,19 @@ class TestErrorRecoveryScenarios:
             assert os.path.exists(log_file)
 
         finally:
-            os.chmod(self.temp_dir, 0o755)  # Restore permissions
+            os.chmod(temp_dir, 0o755)  # Restore permissions
 
     @pytest.mark.integration
-    def test_concurrent_access_conflicts_recovery(self):
+    def test_concurrent_access_conflicts_recovery(self, tmp_path):
         """Test recovery from concurrent access conflicts."""
         import threading
         import time
 
         from src.services.state_manager import StateManager
 
-        state_manager = StateManager(state_dir=self.temp_dir)
+        temp_dir = str(tmp_path)
+
+        state_manager = StateManager(state_dir=temp_dir)
         conflicts = []
 
         def concurrent_save(thread_id):
@@ -264,11 +261,13 @@ class TestErrorRecoveryScenarios:
         assert final_state is not None
 
     @pytest.mark.integration
-    def test_resource_exhaustion_recovery(self):
+    def test_resource_exhaustion_recovery(self, tmp_path):
         """Test recovery from resource exhaustion (file handles, etc.)."""
         from src.models.system_configuration import SystemConfiguration
         from src.services.process_monitor import ProcessMonitor
 
+        temp_dir = str(tmp_path)
+
         config = SystemConfiguration()
         monitor = ProcessMonitor(config)
 
@@ -277,7 +276,7 @@ class TestErrorRecoveryScenarios:
         try:
             # Open many files to approach system limits
             for i in range(1000):
-                f = open(os.path.join(self.temp_dir, f"file_{i}.txt"), "w")
+                f = open(os.path.join(temp_dir, f"file_{i}.txt"), "w")
                 open_files.append(f)
 
             # Should handle resource constraints gracefully
@@ -295,37 +294,35 @@ class TestErrorRecoveryScenarios:
             for f in open_files:
                 try:
                     f.close()
-                except:
+                except OSError:
                     pass
 
             monitor.stop_monitoring()
 
     @pytest.mark.integration
-    def test_timing_drift_recovery(self):
+    def test_timing_drift_recovery(self, fake_clock):
         """Test recovery from system clock changes and timing drift."""
-        from datetime import datetime, timedelta
+        from datetime import timedelta
 
         from src.models.waiting_period import WaitingPeriod
         from src.services.timing_manager import TimingManager
 
-        timing_manager = TimingManager()
+        timing_manager = TimingManager(clock=fake_clock)
 
         # Start a waiting period
-        waiting_period = WaitingPeriod(start_time=datetime.now(), duration_hours=5)
+        waiting_period = WaitingPeriod(start_time=fake_clock.now(), duration_hours=5)
 
         timing_manager.add_waiting_period(waiting_period)
 
-        # Simulate system clock jump backward
-        with patch("src.services.timing_manager.datetime") as mock_datetime:
-            # Clock jumps back 1 hour
-            mock_datetime.now.return_value = datetime.now() - timedelta(hours=1)
+        # Simulate system clock jump backward (clock jumps back 1 hour)
+        fake_clock.advance(timedelta(hours=-1))
 
-            # Should detect clock change and adjust
-            timing_manager.check_clock_drift()
+        # Should detect clock change and adjust
+        timing_manager.check_clock_drift()
 
-            # Should handle gracefully without breaking countdown
-            remaining = timing_manager.get_remaining_time(waiting_period.period_id)
-            assert remaining > timedelta(hours=4)  # Should be reasonable
+        # Should handle gracefully without breaking countdown
+        remaining = timing_manager.get_remaining_time(waiting_period.period_id)
+        assert remaining > timedelta(hours=4)  # Should be reasonable
 
     @pytest.mark.integration
     def test_graceful_degradation_under_stress(self):
@@ -0,0 +1,55 @@
+"""Tests for the /proc based process sampling helpers."""
+
+import os
+
+import pytest
+
+from src.lib import linux_process
+
+
+def test_parse_stat_handles_parentheses_in_command_name():
+    data = b"12 (a) b (c)) S 1 1 1 0 -1 0 0 0 0 0 7 3 0 0 20 0 4 0 1 100 55 0 0"
+
+    stat = linux_process.parse_stat(data)
+
+    assert stat.state == "S"
+    assert (stat.utime, stat.stime) == (7, 3)
+    assert stat.num_threads == 4
+    assert stat.rss_pages == 55
+
+
+@pytest.mark.skipif(not linux_process.AVAILABLE, reason="requires /proc")
+def test_read_stat_for_current_process():
+    stat = linux_process.read_stat(os.getpid())
+
+    assert stat.num_threads >= 1
+    assert stat.rss_bytes > 0
+    assert stat.cpu_seconds >= 0
+
+
+@pytest.mark.skipif(not linux_process.AVAILABLE, reason="requires /proc")
+def test_read_stat_missing_process():
+    with pytest.raises(FileNotFoundError):
+        linux_process.read_stat(2**22 + 1)
+
+
+def test_stat_status_uses_psutil_names():
+    data = b"12 (a) S 1 1 1 0 -1 0 0 0 0 0 7 3 0 0 20 0 4 0 1 100 55 0 0"
+
+    assert linux_process.parse_stat(data).status == "sleeping"
+    assert linux_process.parse_stat(data.replace(b" S ", b" Q ")).status == "Q"
+
+
+@pytest.mark.skipif(not linux_process.AVAILABLE, reason="requires /proc")
+def test_count_open_files_counts_regular_files_only(tmp_path):
+    before = linux_process.count_open_files(os.getpid())
+    read_end, write_end = os.pipe()
+    try:
+        with open(tmp_path / "data.txt", "w"):
+            assert linux_process.count_open_files(os.getpid()) == before + 1
+    finally:
+        os.close(read_end)
+        os.close(write_end)
+
+    with pytest.raises(FileNotFoundError):
+        linux_process.count_open_files(2**22 + 1)
@@ -0,0 +1,32 @@
+"""Tests for MonitoringSession change notification."""
+
+from __future__ import annotations
+
+import threading
+
+from src.models.monitoring_session import MonitoringSession
+
+
+def test_waiters_are_woken_only_by_their_own_session():
+    watched = MonitoringSession(claude_command="claude")
+    other = MonitoringSession(claude_command="claude")
+    assert watched._changed is not other._changed
+
+    evaluations = []
+
+    def predicate():
+        evaluations.append(watched.detection_count)
+        return watched.detection_count > 0
+
+    waiter = threading.Thread(target=watched.wait_until, args=(predicate, 2.0))
+    waiter.start()
+    while not evaluations:
+        pass
+
+    other.detection_count = 5
+    watched.detection_count = 0  # same value, no notification
+    watched.detection_count = 1
+    waiter.join(2.0)
+
+    assert not waiter.is_alive()
+    assert evaluations == [0, 1]
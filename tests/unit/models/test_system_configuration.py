@@ -35,3 +35,18 @@ def test_from_file_merges_defaults(tmp_path):
     assert merged.log_level.value == "DEBUG"
     assert merged.monitoring["task_timeout"] == 300  # default retained
     assert "custom pattern" in merged.detection_patterns
+
+
+def test_from_file_reuses_cached_defaults(tmp_path):
+    from src.models.system_configuration import _default_config_dict
+
+    config_path = Path(tmp_path) / "custom.json"
+    config_path.write_text(json.dumps({"monitoring": {"check_interval": 2.0}}))
+    _default_config_dict.cache_clear()
+
+    first = SystemConfiguration.from_file(str(config_path))
+    first.monitoring["task_timeout"] = 1
+    second = SystemConfiguration.from_file(str(config_path))
+
+    assert _default_config_dict.cache_info().hits == 1
+    assert second.monitoring["task_timeout"] == 300  # cached defaults untouched
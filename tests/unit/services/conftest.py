@@ -0,0 +1,28 @@
+"""Shared fixtures for service unit tests."""
+
+import pytest
+
+from src.models.system_configuration import SystemConfiguration
+from src.services.pattern_detector import PatternDetector
+
+
+@pytest.fixture(scope="module")
+def default_detector():
+    """Provide one detector per module so patterns are compiled once."""
+    return PatternDetector(SystemConfiguration())
+
+
+@pytest.fixture
+def detector(default_detector):
+    """Provide the module detector with fresh state and default patterns.
+
+    Tests may swap patterns with ``update_patterns``; the defaults are
+    restored afterwards.
+    """
+    patterns = list(default_detector.detection_patterns)
+    case_sensitive = default_detector.case_sensitive
+    default_detector.reset_state()
+    yield default_detector
+    default_detector.case_sensitive = case_sensitive
+    default_detector.detection_patterns = patterns
+    default_detector._compile_patterns()
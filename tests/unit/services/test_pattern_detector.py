@@ -1,5 +1,6 @@
 """Unit tests for PatternDetector service."""
 
+import random
 import re
 from datetime import datetime
 from unittest.mock import MagicMock, Mock
@@ -7,7 +8,12 @@ from unittest.mock import MagicMock, Mock
 import pytest
 
 from src.models.system_configuration import SystemConfiguration
-from src.services.pattern_detector import DetectionResult, PatternDetector
+from src.services import pattern_detector as pattern_detector_module
+from src.services.pattern_detector import (
+    DetectionResult,
+    PatternDetector,
+    _PatternScanner,
+)
 
 
 class TestPatternDetectorInitialization:
@@ -35,80 +41,100 @@ class TestPatternDetectorInitialization:
         for pattern in detector.compiled_patterns:
             assert isinstance(pattern, re.Pattern)
 
+    def test_detectors_share_compiled_scanner(self):
+        """Test detectors with the same patterns reuse one compiled scanner."""
+        first = PatternDetector(SystemConfiguration())
+        second = PatternDetector(SystemConfiguration())
 
-class TestPatternMatching:
-    """Test pattern matching functionality."""
+        assert first._scanner is second._scanner
+        assert first.compiled_patterns == second.compiled_patterns
 
-    def test_simple_pattern_match(self):
-        """Test detection of simple pattern."""
+    def test_update_patterns_recompiles_only_new_patterns(self):
+        """Test patterns kept across an update reuse their compiled regex."""
         config = SystemConfiguration()
-        config.detection_patterns = [r"usage limit exceeded"]
-
-        detector = PatternDetector(config)
-        event = detector.detect_limit_message(
-            "Error: usage limit exceeded - please wait"
-        )
-
-        assert event is not None
-        assert event.matched_text is not None
-        assert "usage limit exceeded" in event.matched_text.lower()
-
-    def test_no_match_returns_none(self):
-        """Test that non-matching text returns None."""
-        config = SystemConfiguration()
-        config.detection_patterns = [r"usage limit exceeded"]
-
+        config.detection_patterns = [r"usage limit", r"quota"]
         detector = PatternDetector(config)
-        event = detector.detect_limit_message("Normal operation message")
+        kept = detector.compiled_patterns[0]
 
-        assert event is None
+        detector.update_patterns([r"usage limit", r"cooldown"])
 
-    def test_case_insensitive_matching(self):
-        """Test case-insensitive pattern matching."""
-        config = SystemConfiguration()
-        config.detection_patterns = [r"limit exceeded"]
-        # Assume case_sensitive is False by default
-
-        detector = PatternDetector(config)
-        detector.case_sensitive = False
-        detector._compile_patterns()
-
-        event = detector.detect_limit_message("LIMIT EXCEEDED warning")
-        assert event is not None
-
-
-class TestSystemMessageFiltering:
-    """Test system message filtering."""
-
-    def test_system_message_is_skipped(self):
-        """Test that system/debug messages are skipped."""
-        config = SystemConfiguration()
-        config.detection_patterns = [r".*"]  # Match everything
+        assert detector.compiled_patterns[0] is kept
+        assert [p.pattern for p in detector.compiled_patterns] == [
+            r"usage limit",
+            r"cooldown",
+        ]
 
-        detector = PatternDetector(config)
-        event = detector.detect_limit_message("[DEBUG] System initialization")
+    def test_readded_pattern_reuses_compiled_regex(self, detector):
+        """Test removing and re-adding a pattern does not recompile it."""
+        assert detector.add_pattern(r"cooldown for \d+ minutes")
+        compiled = detector.compiled_patterns[-1]
 
-        assert event is None
+        assert detector.remove_pattern(r"cooldown for \d+ minutes")
+        assert detector.add_pattern(r"cooldown for \d+ minutes")
 
-    def test_normal_message_is_processed(self):
-        """Test that normal messages are processed."""
-        config = SystemConfiguration()
-        config.detection_patterns = [r"limit"]
+        assert detector.compiled_patterns[-1] is compiled
 
-        detector = PatternDetector(config)
-        event = detector.detect_limit_message("User limit reached")
 
-        assert event is not None
+class TestPatternMatching:
+    """Test pattern matching and system message filtering."""
+
+    @pytest.mark.parametrize(
+        "patterns,text,expected",
+        [
+            pytest.param(
+                [r"usage limit exceeded"],
+                "Error: usage limit exceeded - please wait",
+                "usage limit exceeded",
+                id="simple-match",
+            ),
+            pytest.param(
+                [r"usage limit exceeded"],
+                "Normal operation message",
+                None,
+                id="no-match",
+            ),
+            pytest.param(
+                [r"limit exceeded"],
+                "LIMIT EXCEEDED warning",
+                "limit exceeded",
+                id="case-insensitive",
+            ),
+            pytest.param(
+                [r".*"],  # Match everything
+                "[DEBUG] System initialization",
+                None,
+                id="system-message-skipped",
+            ),
+            pytest.param(
+                [r"limit"],
+                "Rate limit check while Connecting to API",
+                None,
+                id="system-marker-mid-line",
+            ),
+            pytest.param(
+                [r"limit"], "User limit reached", "limit", id="normal-message"
+            ),
+            pytest.param([r"limit"], "", None, id="empty-line"),
+        ],
+    )
+    def test_detect_limit_message(self, detector, patterns, text, expected):
+        """Test detection outcome for a single line of output."""
+        detector.update_patterns(patterns)
+
+        event = detector.detect_limit_message(text)
+
+        if expected is None:
+            assert event is None
+        else:
+            assert event is not None
+            assert expected in event.matched_text.lower()
 
 
 class TestConfidenceCalculation:
     """Test confidence score calculation."""
 
-    def test_confidence_increases_with_keywords(self):
+    def test_confidence_increases_with_keywords(self, detector):
         """Test confidence increases with limit-related keywords."""
-        config = SystemConfiguration()
-        detector = PatternDetector(config)
-
         # Message with many keywords should have higher confidence
         confidence_high = detector._calculate_confidence(
             r"limit.*exceeded",
@@ -123,11 +149,8 @@ class TestConfidenceCalculation:
 
         assert confidence_high > confidence_low
 
-    def test_confidence_bounded_to_one(self):
+    def test_confidence_bounded_to_one(self, detector):
         """Test confidence score is capped at 1.0."""
-        config = SystemConfiguration()
-        detector = PatternDetector(config)
-
         confidence = detector._calculate_confidence(
             r"very.*long.*specific.*pattern",
             "very long specific pattern with limit exceeded wait hours quota",
@@ -137,15 +160,28 @@ class TestConfidenceCalculation:
 
         assert confidence <= 1.0
 
+    def test_confidence_uses_per_pattern_base(self):
+        """Test the base score is looked up by index and ignores stale indices."""
+        config = SystemConfiguration()
+        config.detection_patterns = [r"wait", r"rate limit exceeded for the account"]
+        detector = PatternDetector(config)
+        line = "rate limit exceeded for the account"
+
+        assert detector._scanner.base_confidence == pytest.approx([0.3, 0.55])
+        by_index = detector._calculate_confidence(
+            config.detection_patterns[1], line, line, 1
+        )
+        mismatched = detector._calculate_confidence(
+            config.detection_patterns[1], line, line, 0
+        )
+        assert by_index == pytest.approx(mismatched)
+
 
 class TestPatternManagement:
     """Test pattern addition and removal."""
 
-    def test_add_valid_pattern(self):
+    def test_add_valid_pattern(self, detector):
         """Test adding a valid regex pattern."""
-        config = SystemConfiguration()
-        detector = PatternDetector(config)
-
         initial_count = len(detector.detection_patterns)
         success = detector.add_pattern(r"new.*pattern")
 
@@ -153,20 +189,48 @@ class TestPatternManagement:
         assert len(detector.detection_patterns) == initial_count + 1
         assert r"new.*pattern" in detector.detection_patterns
 
-    def test_add_invalid_pattern(self):
+    def test_add_invalid_pattern(self, detector):
         """Test adding an invalid regex pattern fails."""
-        config = SystemConfiguration()
-        detector = PatternDetector(config)
-
         success = detector.add_pattern(r"invalid[pattern")  # Unclosed bracket
 
         assert success is False
 
-    def test_remove_existing_pattern(self):
+    @pytest.mark.parametrize(
+        "pattern,balanced",
+        [
+            (r"invalid[pattern", False),
+            (r"(unclosed", False),
+            (r"stray)", False),
+            (r"\[escaped\)", True),
+            (r"[(]", True),
+            (r"[]()]", True),
+            (r"(?#comment ( ) ok", True),
+        ],
+    )
+    def test_unbalanced_brackets_rejected_before_compile(
+        self, detector, monkeypatch, pattern, balanced
+    ):
+        """Test the bracket precheck only rejects patterns re cannot compile."""
+        compiled = []
+        original = pattern_detector_module._compile_cached
+        monkeypatch.setattr(
+            pattern_detector_module,
+            "_compile_cached",
+            lambda *args: compiled.append(args) or original(*args),
+        )
+
+        assert detector.add_pattern(pattern) is balanced
+        assert bool(compiled) is balanced
+
+    def test_test_pattern_uses_detection_flags(self, detector):
+        """Test test_pattern matches across lines like detection does."""
+        result = detector.test_pattern(r"usage.*limit", "Your USAGE\nlimit is reached")
+
+        assert result.matched is True
+
+    def test_remove_existing_pattern(self, detector):
         """Test removing an existing pattern."""
-        config = SystemConfiguration()
-        config.detection_patterns = [r"test", r"pattern"]
-        detector = PatternDetector(config)
+        detector.update_patterns([r"test", r"pattern"])
 
         success = detector.remove_pattern(r"test")
 
@@ -174,11 +238,8 @@ class TestPatternManagement:
         assert r"test" not in detector.detection_patterns
         assert len(detector.detection_patterns) == 1
 
-    def test_remove_nonexistent_pattern(self):
+    def test_remove_nonexistent_pattern(self, detector):
         """Test removing non-existent pattern returns False."""
-        config = SystemConfiguration()
-        detector = PatternDetector(config)
-
         success = detector.remove_pattern(r"nonexistent")
 
         assert success is False
@@ -204,24 +265,338 @@ class TestPerformanceOptimization:
         assert result.matched is True
         assert result.confidence > 0.8
 
-    def test_empty_line_returns_immediately(self):
-        """Test empty lines return immediately without processing."""
+    def test_specific_pattern_checked_first_and_ends_search(
+        self, detector, monkeypatch
+    ):
+        """Test a top-confidence specific match skips the generic pattern."""
+        detector.update_patterns([r"quota", r"daily quota used up, wait \d+ hours"])
+        assert detector._scanner.search_order == [1, 0]
+        searched = []
+
+        class Recording:
+            def __init__(self, pattern):
+                self.compiled = pattern
+                self.pattern = pattern.pattern
+
+            def search(self, text):
+                searched.append(self.pattern)
+                return self.compiled.search(text)
+
+        monkeypatch.setattr(
+            detector,
+            "compiled_patterns",
+            [Recording(p) for p in detector.compiled_patterns],
+        )
+
+        result = detector._check_line_for_patterns(
+            "Error: daily quota used up, wait 5 hours", 1
+        )
+
+        assert result.pattern == r"daily quota used up, wait \d+ hours"
+        assert result.confidence == 1.0
+        assert searched == [r"daily quota used up, wait \d+ hours"]
+
+    def test_candidate_indices_cover_every_matching_pattern(self):
+        """Test the multi-pattern prefilter never drops a real match."""
+        config = SystemConfiguration()
+        config.detection_patterns = [
+            r"usage limit exceeded",
+            r"rate.*limit.*\d+.*hours?",
+            r"사용 제한",
+            r"cooldown",
+        ]
+        detector = PatternDetector(config)
+
+        text = "Rate LIMIT hit, retry in 5 hours (사용 제한)"
+        candidates = set(detector._candidate_indices(text))
+
+        for index, pattern in enumerate(detector.compiled_patterns):
+            if pattern.search(text):
+                assert index in candidates
+
+    @pytest.mark.parametrize("accelerator", ["ahocorasick", None])
+    def test_candidate_indices_match_re_on_random_input(self, monkeypatch, accelerator):
+        """Test candidate narrowing keeps every pattern re matches."""
+        if accelerator is None:
+            monkeypatch.setattr(pattern_detector_module, "ahocorasick", None)
+        else:
+            pytest.importorskip(accelerator)
+
+        rng = random.Random(str(accelerator))
+        atoms = ["wait", "limit", "a", "K", " ", r"\b", r"\B", r"\d", r"\s", r"\W"]
+        atoms += [".", "[a-c]", "[^a]", "^", "$", r"\Z", "_", ":", "é", r"\x1c"]
+        alphabet = ["wait", "LIMIT", "a", "B", "K", " ", "1", "_", ":", "\n"]
+        alphabet += ["\t", "\x1c", "é"]
+
+        def random_pattern(depth=0):
+            parts = []
+            for _ in range(rng.randint(1, 4)):
+                if depth < 2 and rng.random() < 0.15:
+                    part = (
+                        f"(?:{random_pattern(depth + 1)}|{random_pattern(depth + 1)})"
+                    )
+                else:
+                    part = rng.choice(atoms)
+                if part[0] not in "^$\\" and rng.random() < 0.25:
+                    part += rng.choice(["?", "*", "+", "{1,2}", "{,2}"])
+                parts.append(part)
+            return "".join(parts)
+
+        for _ in range(15):
+            flags = rng.choice([re.IGNORECASE, 0]) | re.MULTILINE | re.DOTALL
+            compiled = [re.compile(r"usage limit", flags)]
+            while len(compiled) < 6:
+                try:
+                    compiled.append(re.compile(random_pattern(), flags))
+                except re.error:
+                    pass
+            scanner = _PatternScanner(tuple(compiled), flags)
+            assert (scanner.literal_automaton is None) is (accelerator is None)
+
+            for _ in range(100):
+                text = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 40)))
+                candidates = set(scanner.candidate_indices(text))
+                for index, pattern in enumerate(compiled):
+                    if pattern.search(text):
+                        assert index in candidates, (pattern.pattern, text)
+
+    def test_candidates_keep_every_literal_pattern_present(self):
+        """Test a pattern whose literal is in the text is never dropped."""
+        config = SystemConfiguration(monitoring={"case_sensitive_patterns": True})
+        config.detection_patterns = [
+            r"(?:usage|quota)",
+            r"try",
+            r"\d+ hours (?:Usage|hours)",
+            r"quota.*(?:hit|quota)",
+        ]
+        detector = PatternDetector(config)
+
+        assert 1 in detector._candidate_indices("limit error 12 try")
+
+    def test_literal_automaton_holds_only_ascii_literals(self):
+        """Test non-ASCII literals stay on the ``re`` path."""
+        pytest.importorskip("ahocorasick")
         config = SystemConfiguration()
+        config.detection_patterns = [r"usage limit", r"사용 제한", r"cooldown"]
+        scanner = PatternDetector(config)._scanner
+
+        automaton = scanner._build_literal_automaton()
+
+        assert automaton is not None
+        assert scanner.regex_indices == [1]
+        assert "usage limit" in automaton
+        assert "사용 제한" not in automaton
+
+    def test_literal_automaton_narrows_regex_patterns(self):
+        """Test regex patterns are keyed by their required literal."""
+        pytest.importorskip("ahocorasick")
+        config = SystemConfiguration()
+        config.detection_patterns = [
+            r"rate.*limit.*\d+.*hours?",
+            r"retry in \d+ minutes",
+            r"\d+ minutes?|\d+ hours?",
+        ]
         detector = PatternDetector(config)
+        scanner = detector._scanner
+
+        assert scanner.regex_indices == [2]
+        assert list(scanner.candidate_indices("RETRY IN 5 minutes")) == [1, 2]
+        assert list(scanner.candidate_indices("nothing to see")) == [2]
+
+    def test_line_check_skips_patterns_when_union_misses(self, detector, monkeypatch):
+        """Test one union search rules out every candidate pattern."""
+        detector.update_patterns([r"usage limit \d+", r"limit of \d+ requests"])
+        monkeypatch.setattr(detector, "_candidate_indices", lambda text: [0, 1])
+        searched = []
+
+        class Tracking:
+            def __init__(self, pattern):
+                self.pattern = pattern.pattern
+
+            def search(self, text):
+                searched.append(self.pattern)
+                return None
+
+        monkeypatch.setattr(
+            detector,
+            "compiled_patterns",
+            [Tracking(p) for p in detector.compiled_patterns],
+        )
 
-        result = detector._check_line_for_patterns("", 1)
+        result = detector._check_line_for_patterns("usage limit unknown", 1)
 
         assert result.matched is False
+        assert searched == []
+
+    def test_block_scan_prefers_longer_pattern(self):
+        """Test the combined block scan reports the most specific pattern."""
+        config = SystemConfiguration()
+        config.detection_patterns = [r"limit", r"usage limit exceeded"]
+        detector = PatternDetector(config)
+
+        matches = dict(detector._iter_block_matches("usage limit exceeded\nbye"))
+
+        assert matches[1].group() == "usage limit exceeded"
+
+    def test_block_scan_reports_matches_inside_other_matches(self):
+        """Test a pattern matching only inside another's match is scored."""
+        config = SystemConfiguration()
+        config.detection_patterns = [r"usage.*limit", r"wait", r"quota"]
+        detector = PatternDetector(config)
+        text = "limit \n Usage Limit reached 2 hours wait [DEBUG] Usage Limit usage"
+
+        matches = dict(detector._iter_block_matches(text))
+        result = detector._check_text_block_for_patterns(text, 2)
+
+        assert matches[1].group() == "wait"
+        assert result.pattern == "wait"
+        assert result.confidence == pytest.approx(0.75)
+
+    def test_block_scan_finds_word_boundary_pattern(self):
+        """Test a block ending in a word-boundary match is detected."""
+        config = SystemConfiguration()
+        config.detection_patterns = [
+            r"\bwait\b",
+            r"(?:usage|rate) limit",
+            r"limit (reached|hit)",
+        ]
+        detector = PatternDetector(config)
+
+        matches = dict(
+            detector._iter_block_matches("hours 3 please exceeded 3 Fehler: wait")
+        )
+
+        assert matches[0].group() == "wait"
+
+    def test_word_boundary_pattern_detected(self):
+        """Test a word-boundary pattern ending the line is detected."""
+        config = SystemConfiguration()
+        config.detection_patterns = [
+            r"\bwait\b",
+            r"(?:usage|rate) limit",
+            r"limit (reached|hit)",
+        ]
+        detector = PatternDetector(config)
+
+        event = detector.detect_limit_message("hours 3 please exceeded 3 Fehler: wait")
+
+        assert event is not None
+        assert event.matched_pattern == r"\bwait\b"
+
+    def test_backreference_patterns_skip_union(self):
+        """Test patterns with backreferences fall back to separate searches."""
+        config = SystemConfiguration()
+        config.detection_patterns = [r"(limit) \1", r"quota"]
+        detector = PatternDetector(config)
+
+        assert detector._scanner.union is None
+        assert [i for i, _ in detector._iter_block_matches("limit limit")] == [0]
+
+    def test_literal_prefilter_selects_candidate_lines(self):
+        """Test only lines containing a required literal are checked."""
+        config = SystemConfiguration()
+        config.detection_patterns = [r"rate.*limit.*\d+.*hours?", r"사용 제한"]
+        detector = PatternDetector(config)
+        scanner = detector._scanner
+
+        assert scanner.candidate_lines("x" * 1000) == []
+        text = "[INFO] ok\nRATE LIMIT for 5 hours\nnoise\n사용 제한\n"
+        assert scanner.candidate_lines(text) == [1, 3]
+
+    def test_raw_bytes_lines_detected(self):
+        """Test raw captured lines are decoded and detected like text."""
+        config = SystemConfiguration()
+        config.detection_patterns = [r"usage limit exceeded", r"사용 제한"]
+        detector = PatternDetector(config)
+
+        event = detector.detect_limit_message(b"Usage limit exceeded")
+        assert event is not None
+        assert event.matched_text == "Usage limit exceeded"
+        assert detector.detect_limit_message("사용 제한".encode("cp949"), "cp949")
+
+    def test_literal_prefilter_disabled_without_required_literal(self):
+        """Test patterns with no guaranteed literal turn the prefilter off."""
+        config = SystemConfiguration()
+        config.detection_patterns = [r"usage limit", r"\d+ minutes?|\d+ hours?"]
+        detector = PatternDetector(config)
+
+        assert detector._scanner.probe_regex is None
+        assert detector._scanner.candidate_lines("anything") is None
+
+    def test_streaming_partial_line_is_bounded(self):
+        """Test a stream without newlines does not grow the carried tail."""
+        config = SystemConfiguration()
+        detector = PatternDetector(config)
+
+        for _ in range(100):
+            detector.process_chunk("x" * 1000)
+
+        assert len(detector._partial_line) <= detector._stream_window
+        assert detector.process_chunk(" usage limit exceeded\n") is not None
+
+    def test_streaming_partial_line_skips_text_without_probes(self):
+        """Test a growing partial line is only re-detected when it can match."""
+        config = SystemConfiguration()
+        config.detection_patterns = [r"usage limit exceeded", r"quota exceeded"]
+        detector = PatternDetector(config)
+
+        for _ in range(50):
+            assert detector.process_chunk("streaming output ") is None
+        assert detector.line_number == 0
+
+        detection = detector.process_chunk("usage limit exc")
+        detection = detection or detector.process_chunk("eeded")
+
+        assert detection is not None
+        assert detector._partial_line == ""
+
+    def test_streaming_probe_search_resumes_at_scan_position(self, monkeypatch):
+        """Test each chunk's probe search starts near the end of the old text."""
+        config = SystemConfiguration()
+        config.detection_patterns = [r"usage limit exceeded"]
+        detector = PatternDetector(config)
+        starts = []
+        has_probe = detector._scanner.has_probe
+
+        def record(text, start=0):
+            starts.append(start)
+            return has_probe(text, start)
+
+        monkeypatch.setattr(detector._scanner, "has_probe", record)
+        detector.process_chunk("x" * 30)
+        detector.process_chunk("y" * 30)
+        detector.process_chunk(" usage lim")
+        detector.process_chunk("it exceeded")
+
+        width = detector._scanner.probe_width
+        assert starts == [0, 30 - width + 1, 60 - width + 1, 70 - width + 1]
+        assert detector._partial_line == ""
+
+    def test_streaming_partial_line_uses_heuristics(self):
+        """Test a partial line is detected by heuristics, not only patterns."""
+        detector = PatternDetector(SystemConfiguration())
+
+        detection = detector.process_chunk("Your usage limit was reached today")
+
+        assert detection is not None
+        assert detection.confidence == pytest.approx(0.9)
+
+    def test_streaming_partial_line_not_rechecked_without_new_text(self):
+        """Test an empty chunk does not run detection on the same tail again."""
+        detector = PatternDetector(SystemConfiguration())
+
+        assert detector.process_chunk("please stand by, waiting on it") is None
+        lines_processed = detector.line_number
+        assert detector.process_chunk("") is None
+        assert detector.line_number == lines_processed
 
 
 class TestDetectionStatistics:
     """Test detection statistics tracking."""
 
-    def test_statistics_track_detections(self):
+    def test_statistics_track_detections(self, detector):
         """Test statistics correctly track detection count."""
-        config = SystemConfiguration()
-        config.detection_patterns = [r"limit"]
-        detector = PatternDetector(config)
+        detector.update_patterns([r"limit"])
 
         detector.detect_limit_message("limit reached")
         detector.detect_limit_message("limit exceeded")
@@ -231,14 +606,81 @@ class TestDetectionStatistics:
         assert stats["total_detections"] == 2
         assert stats["lines_processed"] > 0
 
-    def test_statistics_include_processing_time(self):
-        """Test statistics include average processing time."""
-        config = SystemConfiguration()
+    def test_detection_history_is_bounded(self):
+        """Test history keeps only the configured number of events."""
+        config = SystemConfiguration(monitoring={"detection_history_size": 3})
+        config.detection_patterns = [r"limit"]
         detector = PatternDetector(config)
 
+        for i in range(5):
+            detector.detect_limit_message(f"limit reached {i}")
+
+        history = detector.get_detection_history()
+        assert [event.line_number for event in history] == [3, 4, 5]
+        recent = detector.get_detection_history(limit=2)
+        assert [event.line_number for event in recent] == [4, 5]
+        assert detector.detection_count == 5
+        assert detector.get_statistics()["total_detections"] == 5
+
+        detector.clear_history()
+        assert detector.get_statistics()["total_detections"] == 0
+
+    def test_repeated_detection_within_dedup_window_reuses_event(self):
+        """Test identical matches inside the dedup window are recorded once."""
+        config = SystemConfiguration(monitoring={"detection_dedup_seconds": 60})
+        detector = PatternDetector(config)
+
+        first = detector.detect_limit_message("usage limit exceeded")
+        second = detector.detect_limit_message("usage limit exceeded")
+
+        assert first is not None
+        assert second is first
+        assert len(detector.get_detection_history()) == 1
+
+    def test_statistics_include_processing_time(self, detector):
+        """Test statistics include average processing time."""
         detector.detect_limit_message("test message")
 
         stats = detector.get_statistics()
 
         assert "average_processing_time_ms" in stats
         assert isinstance(stats["average_processing_time_ms"], float)
+
+    def test_statistics_rebuilt_only_when_counters_change(self, detector):
+        """Test polling statistics between detections reuses the figures."""
+        detector.detect_limit_message("usage limit exceeded")
+
+        stats = detector.get_statistics()
+        stats["total_detections"] = -1
+        cached = detector._stats_cache
+        assert detector.get_statistics()["total_detections"] == 1
+        assert detector._stats_cache is cached
+
+        detector.detect_limit_message("quota exceeded")
+        assert detector.get_statistics()["total_detections"] == 2
+        assert detector._stats_cache is not cached
+
+    def test_statistics_cache_ignores_processing_time(self, detector):
+        """Test timing is read fresh without rebuilding the cached figures."""
+        detector.detect_limit_message("usage limit exceeded")
+        detector.get_statistics()
+        cached = detector._stats_cache
+
+        detector.total_processing_time = 0.5
+        stats = detector.get_statistics()
+
+        assert detector._stats_cache is cached
+        assert stats["average_processing_time_ms"] == pytest.approx(500.0)
+
+    def test_reset_state_keeps_compiled_patterns(self, detector):
+        """Test reset_state clears counters but not the compiled scanner."""
+        scanner = detector._scanner
+        detector.detect_limit_message("usage limit exceeded")
+        detector.process_chunk("partial")
+
+        detector.reset_state()
+
+        assert detector._scanner is scanner
+        assert detector.get_detection_history() == []
+        assert detector.get_statistics()["lines_processed"] == 0
+        assert detector._partial_line == ""
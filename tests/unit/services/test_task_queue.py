@@ -54,3 +54,16 @@ def test_clear_prepend_and_serialization():
     ]
     manager.prepend(new_tasks)
     assert manager.list_tasks()[0].description == "prepended-1"
+
+
+def test_remove_indices_keeps_order_and_ignores_invalid():
+    manager = TaskQueueManager(QueuedTask(description=f"task-{i}") for i in range(1, 6))
+
+    removed = manager.remove_indices([4, 2, 2, 0, 9, "3"])
+
+    assert [task.description for task in removed] == ["task-2", "task-4"]
+    assert [task.description for task in manager.list_tasks()] == [
+        "task-1",
+        "task-3",
+        "task-5",
+    ]
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-from src.services.template_manager import TemplateManager
+from src.services.template_manager import TEMPLATE_MANAGER
 
 
 def test_builtin_templates_available():
-    manager = TemplateManager()
+    manager = TEMPLATE_MANAGER
     templates = {tmpl.template_id: tmpl for tmpl in manager.available_templates()}
 
     # Ensure expected templates exist
@@ -18,3 +18,10 @@ def test_builtin_templates_available():
     assert backend is not None
     prompt = backend.build_guideline_prompt()
     assert "Quality" in prompt or prompt  # ensure prompt is generated
+
+
+def test_guideline_prompt_is_built_once():
+    backend = TEMPLATE_MANAGER.get("backend_feature")
+
+    assert backend.build_guideline_prompt() is backend.build_guideline_prompt()
+    assert backend.build_guideline_prompt().startswith("### ")
@@ -0,0 +1,32 @@
+"""Tests for TimingManager."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from src.services.timing_manager import TimingManager
+
+
+def test_waiting_period_completes_when_clock_passes_end(fake_clock):
+    manager = TimingManager(clock=fake_clock)
+    period = manager.add_waiting_period(duration_hours=1.0)
+
+    try:
+        assert manager.check_waiting_periods() == []
+
+        fake_clock.advance(timedelta(hours=1, minutes=5))
+
+        assert manager.check_waiting_periods() == [period.period_id]
+        assert period.is_completed()
+    finally:
+        manager.stop_monitoring()
+
+
+def test_clock_keeps_moving_after_advance(fake_clock):
+    fake_clock.advance(timedelta(hours=5))
+
+    first = fake_clock.now()
+    second = fake_clock.now()
+
+    assert second >= first
+    assert TimingManager(clock=fake_clock).clock.now() >= second
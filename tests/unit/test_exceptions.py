@@ -75,6 +75,16 @@ class TestExceptionContext:
         assert enhanced.details["original"] == "value"
         assert enhanced.details["added"] == "new_value"
 
+    def test_with_context_refreshes_string_form(self):
+        """Test str() reflects details added after it was first formatted."""
+        exc = MonitoringException("Error", details={"original": "value"})
+        assert "added" not in str(exc)
+
+        with_context(exc, {"added": "new_value"})
+
+        assert "added" in str(exc)
+        assert str(exc) is str(exc)
+
     def test_with_context_on_standard_exception(self):
         """Test with_context on non-MonitoringException returns unchanged."""
         exc = ValueError("Standard error")
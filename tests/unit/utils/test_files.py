@@ -0,0 +1,38 @@
+"""Tests for file helpers."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from src.utils.files import atomic_write_bytes
+
+
+def test_atomic_write_bytes_replaces_file(tmp_path, monkeypatch):
+    target = tmp_path / "state.json"
+    target.write_text("old", encoding="utf-8")
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+
+    atomic_write_bytes(str(target), b'{"ok": true}', durable=True)
+
+    assert target.read_text(encoding="utf-8") == '{"ok": true}'
+    assert not (tmp_path / "state.json.tmp").exists()
+    assert len(synced) == 1
+
+
+def test_atomic_write_bytes_keeps_original_on_failure(tmp_path, monkeypatch):
+    target = tmp_path / "state.json"
+    target.write_text("old", encoding="utf-8")
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+
+    with pytest.raises(OSError):
+        atomic_write_bytes(str(target), b"new")
+
+    assert target.read_text(encoding="utf-8") == "old"
+    assert not (tmp_path / "state.json.tmp").exists()
@@ -2,16 +2,22 @@
 
 from __future__ import annotations
 
-import json
 import logging
-from pathlib import Path
 
-from src.utils.logging import ContextLogger, configure_default_logger, get_logger
+import pytest
 
+import src.utils.logging as logging_utils
+from src.utils.logging import (
+    ContextLogger,
+    configure_default_logger,
+    get_default_logger,
+    get_logger,
+)
 
-def test_context_logger_adds_and_restores_context(caplog):
+
+def test_context_logger_adds_and_restores_context(caplog, request):
     caplog.set_level(logging.INFO)
-    logger = get_logger("coverage-test")
+    logger = get_logger(f"coverage-test-{request.node.name}")
     logger.clear_context()
     logger.add_context(request_id="123")
 
@@ -19,7 +25,7 @@ def test_context_logger_adds_and_restores_context(caplog):
         logger.info("message", extra_field="value")
 
     # Inspect the last log record captured
-    record = json.loads(caplog.text.splitlines()[-1])
+    record = caplog.records[-1].structured_data
     assert record["user"] == "alice"
     assert record["request_id"] == "override"
     assert record["extra_field"] == "value"
@@ -29,11 +35,34 @@ def test_context_logger_adds_and_restores_context(caplog):
     assert "user" not in logger.context
 
 
-def test_configure_default_logger_creates_file(tmp_path):
-    log_file = Path(tmp_path) / "app.log"
+@pytest.fixture(scope="module")
+def default_log_file(tmp_path_factory):
+    """Configure the default logger with a file handler for this module."""
+    previous = logging_utils._default_logger
+    log_file = tmp_path_factory.mktemp("logs") / "app.log"
     logger = configure_default_logger(level="DEBUG", log_file=str(log_file))
-    logger.info("hello world")
+    yield log_file
+
+    for handler in list(logger.logger.handlers):
+        if getattr(handler, "baseFilename", None) == str(log_file):
+            logger.logger.removeHandler(handler)
+            handler.close()
+    logging_utils._default_logger = previous
+
+
+def test_configure_default_logger_creates_file(default_log_file):
+    get_default_logger().info("hello world")
+
+    assert default_log_file.exists()
+    assert "hello world" in default_log_file.read_text()
+
+
+def test_structured_log_accepts_non_str_keys_and_wide_ints(caplog, request):
+    caplog.set_level(logging.INFO)
+    logger = get_logger(f"coverage-test-{request.node.name}")
+
+    logger.info("counts", counts={1: 2}, total=2**70)
 
-    assert log_file.exists()
-    contents = log_file.read_text()
-    assert "hello world" in contents
+    record = caplog.records[-1]
+    assert '"counts":{"1":2}' in record.structured_json
+    assert f'"total":{2**70}' in record.structured_json
@@ -0,0 +1,84 @@
+"""Tests for JSON encoding helpers."""
+
+from __future__ import annotations
+
+import json
+import math
+from datetime import datetime
+
+import pytest
+
+from src.utils import serialization
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_matches_stdlib_layout(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+    data = {"name": "café", "values": [1, 2.5, None], "nested": {"ok": True}}
+
+    pretty = serialization.dumps(data, indent=True)
+
+    assert pretty == json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    assert serialization.loads(pretty) == data
+    assert serialization.loads(serialization.dumps(data).decode("utf-8")) == data
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_loads_raises_json_decode_error(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+
+    with pytest.raises(json.JSONDecodeError):
+        serialization.loads(b"{not json")
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_default_receives_datetimes(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+    moment = datetime(2024, 1, 2, 3, 4, 5)
+
+    encoded = serialization.dumps({"at": moment, "n": 1}, default=str)
+
+    assert json.loads(encoded) == {"at": str(moment), "n": 1}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_matches_stdlib_for_keys_and_wide_ints(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+    data = {1: 2**70, None: [2.5], True: "x"}
+
+    encoded = serialization.dumps(data)
+
+    assert encoded == json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_loads_accepts_nan_like_stdlib(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+
+    assert math.isnan(serialization.loads(b"[NaN]")[0])
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_rejects_datetimes_without_default(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+
+    with pytest.raises(TypeError):
+        serialization.dumps({"at": datetime(2024, 1, 2)})